@@ -1,52 +1,570 @@
 import argparse
+import asyncio
+import json
+import os
+import struct
+import sys
+import time
 
 
-def main():
-    parser = argparse.ArgumentParser(description="Description of your program")
-    parser.add_argument("--input", help="Input file", required=True)
-    args = vars(parser.parse_args())
+# Number of positions on the dial
+DIAL_SIZE = 100
+
+# Dial state before any rotation
+STARTING_POSITION = 50
+
+# Checkpoint index layout: a header followed by one record per checkpoint.
+# Header: magic, checkpoint interval, number of rotations, size and modification
+# time (in nanoseconds) of the input file.
+# Record: dial position, zeros seen so far, byte offset of the next rotation.
+INDEX_MAGIC = b"DIAL2IDX"
+INDEX_HEADER = struct.Struct("<8sqqqq")
+INDEX_RECORD = struct.Struct("<qqq")
+
+
+def timed(iterable, stats: dict, phase: str, counter: str | None = None):
+    """Yield the items of iterable while profiling it.
 
+    The time spent producing the items is added to stats["phases"][phase] and,
+    if counter is given, the number of items to stats["counters"][counter].
+    """
+    phases = stats["phases"]
+    counters = stats["counters"]
+    phases.setdefault(phase, 0.0)
+    if counter is not None:
+        counters.setdefault(counter, 0)
+    iterator = iter(iterable)
+    while True:
+        start = time.perf_counter()
+        try:
+            item = next(iterator)
+        except StopIteration:
+            phases[phase] += time.perf_counter() - start
+            return
+        phases[phase] += time.perf_counter() - start
+        if counter is not None:
+            counters[counter] += 1
+        yield item
+
+
+def apply_rotation(
+    dial_position: int,
+    direction: str,
+    steps: int,
+    verbose: bool = False,
+    dial_size: int = DIAL_SIZE,
+) -> tuple[int, int]:
+    """Apply a single rotation to the dial.
+
+    Args:
+        dial_position: The current position of the dial
+        direction: "R" or "L"
+        steps: Number of steps to rotate
+        verbose: If True, print debug information
+        dial_size: Number of positions on the dial
+
+    Returns:
+        A tuple of (new dial position, number of zeros seen during the rotation)
+    """
     number_of_zeros_seen = 0
-    dial_position = 50
 
-    with open(args["input"], "r") as file:
-        for line in file:
-            print("\nrotation: ", line.rstrip())
-            direction = line[0]
-            steps = int(line[1:])
+    if steps % dial_size != steps:
+        if verbose:
+            print(
+                f"{steps / dial_size} rotations of the dial back to the same position. incrementing number_of_zeros_seen by {steps / dial_size}"
+            )
+        number_of_zeros_seen += steps // dial_size
+        steps = steps % dial_size
 
-            if steps % 100 != steps:
+    if direction == "R":
+        if dial_position + steps > dial_size:
+            if verbose:
+                print(
+                    f"dial_position + steps > {dial_size}. incrementing number_of_zeros_seen by 1"
+                )
+            number_of_zeros_seen += 1
+        dial_position += steps
+        dial_position = dial_position % dial_size
+    elif direction == "L":
+        if dial_position != 0 and dial_position - steps < 0:
+            if verbose:
                 print(
-                    f"{steps / 100} rotations of the dial back to the same position. incrementing number_of_zeros_seen by {steps / 100}"
+                    "dial_position - steps < 0. incrementing number_of_zeros_seen by 1"
                 )
-                number_of_zeros_seen += int(steps / 100)
-                steps = steps % 100
+            number_of_zeros_seen += 1
+        dial_position += dial_size - steps
+        dial_position = dial_position % dial_size
+
+    if dial_position == 0:
+        number_of_zeros_seen += 1
+
+    return dial_position, number_of_zeros_seen
+
+
+def count_zeros_seen(
+    input_file: str, verbose: bool = False, stats: dict | None = None
+) -> int:
+    """Count the number of times the dial points at zero.
+
+    Args:
+        input_file: Path to the file of rotations, one per line (e.g. "L68")
+        verbose: If True, print debug information
+        stats: If given, a {"phases": {}, "counters": {}} dictionary that is
+            filled with the time spent reading the input and computing, and
+            with the number of rotations applied
+
+    Returns:
+        The number of zeros seen
+    """
+    number_of_zeros_seen = 0
+    dial_position = STARTING_POSITION
+
+    with open(input_file, "r") as file:
+        lines = file
+        if stats is not None:
+            start = time.perf_counter()
+            lines = timed(file, stats, "parse", counter="rotations")
+
+        for line in lines:
+            if verbose:
+                print("\nrotation: ", line.rstrip())
+            direction = line[0]
+            steps = int(line[1:])
+
+            dial_position, zeros = apply_rotation(
+                dial_position, direction, steps, verbose
+            )
+            number_of_zeros_seen += zeros
+
+            if verbose:
+                print("dial_position: ", dial_position)
+                print("number_of_zeros_seen: ", number_of_zeros_seen)
+
+    if stats is not None:
+        stats["phases"]["compute"] = (
+            time.perf_counter() - start - stats["phases"]["parse"]
+        )
+
+    return number_of_zeros_seen
+
+
+def count_zeros_for_all_starting_positions(
+    input_file: str, dial_size: int = DIAL_SIZE
+) -> list[int]:
+    """Count the zeros seen for every starting position in a single pass.
+
+    All dials receive the same rotations, so after any rotation each one has
+    moved by the same shift from its starting position. For a rotation, the
+    dials that see an extra zero are those whose current position lies in one
+    contiguous range, which maps back to a contiguous (wrapping) range of
+    starting positions. These ranges are accumulated in a difference array,
+    so each rotation costs O(1) whatever the dial size.
+
+    Args:
+        input_file: Path to the file of rotations, one per line (e.g. "L68")
+        dial_size: Number of positions on the dial
+
+    Returns:
+        A list where item i is the number of zeros seen when starting at position i
+    """
+    full_rotations = 0
+    shift = 0
+    difference = [0] * (dial_size + 1)
+
+    with open(input_file, "r") as file:
+        for line in file:
+            direction = line[0]
+            rotations, steps = divmod(int(line[1:]), dial_size)
+            full_rotations += rotations
+
+            # Current positions that pass or land on zero (see apply_rotation)
+            if steps == 0 or direction not in ("R", "L"):
+                first, last = 0, 0
+            elif direction == "R":
+                first, last = dial_size - steps, dial_size - 1
+            else:
+                first, last = 1, steps
+
+            # The starting positions of those dials, which may wrap around
+            start = (first - shift) % dial_size
+            end = start + last - first
+            difference[start] += 1
+            if end < dial_size:
+                difference[end + 1] -= 1
+            else:
+                difference[dial_size] -= 1
+                difference[0] += 1
+                difference[end - dial_size + 1] -= 1
 
             if direction == "R":
-                if dial_position + steps > 100:
-                    print(
-                        "dial_position + steps > 100. incrementing number_of_zeros_seen by 1"
-                    )
-                    number_of_zeros_seen += 1
-                dial_position += steps
-                dial_position = dial_position % 100
+                shift = (shift + steps) % dial_size
             elif direction == "L":
-                if dial_position != 0 and dial_position - steps < 0:
-                    print(
-                        "dial_position - steps < 0. incrementing number_of_zeros_seen by 1"
-                    )
-                    number_of_zeros_seen += 1
-                dial_position += 100 - steps
-                dial_position = dial_position % 100
+                shift = (shift - steps) % dial_size
+
+    zeros = []
+    running = full_rotations
+    for starting_position in range(dial_size):
+        running += difference[starting_position]
+        zeros.append(running)
+    return zeros
+
+
+def build_checkpoint_index(
+    input_file: str, index_file: str, checkpoint_interval: int = 1000
+) -> int:
+    """Write a sidecar index with the dial state every checkpoint_interval rotations.
+
+    Args:
+        input_file: Path to the file of rotations, one per line (e.g. "L68")
+        index_file: Path of the index to write
+        checkpoint_interval: Number of rotations between checkpoints
+
+    Returns:
+        The number of rotations in the input file
+    """
+    if checkpoint_interval < 1:
+        raise ValueError("checkpoint_interval must be at least 1")
+
+    number_of_zeros_seen = 0
+    dial_position = STARTING_POSITION
+    offset = 0
+    rotations = 0
+
+    with open(input_file, "rb") as file, open(index_file, "wb") as index:
+        input_mtime_ns = os.fstat(file.fileno()).st_mtime_ns
+        # The header is rewritten once the number of rotations is known
+        index.write(INDEX_HEADER.pack(INDEX_MAGIC, checkpoint_interval, 0, 0, 0))
+        index.write(INDEX_RECORD.pack(dial_position, number_of_zeros_seen, offset))
+
+        for line in file:
+            dial_position, zeros = apply_rotation(
+                dial_position, line[:1].decode(), int(line[1:])
+            )
+            number_of_zeros_seen += zeros
+            offset += len(line)
+            rotations += 1
+
+            if rotations % checkpoint_interval == 0:
+                index.write(
+                    INDEX_RECORD.pack(dial_position, number_of_zeros_seen, offset)
+                )
+
+        index.seek(0)
+        index.write(
+            INDEX_HEADER.pack(
+                INDEX_MAGIC, checkpoint_interval, rotations, offset, input_mtime_ns
+            )
+        )
+
+    return rotations
+
+
+def query_dial_state(input_file: str, index_file: str, rotation: int) -> tuple[int, int]:
+    """Return the dial state after a given rotation, using a checkpoint index.
+
+    Only the rotations between the nearest checkpoint and the requested one
+    are replayed.
+
+    Args:
+        input_file: Path to the file of rotations the index was built from
+        index_file: Path to the index written by build_checkpoint_index
+        rotation: Number of rotations applied (0 is the starting state)
+
+    Returns:
+        A tuple of (dial position, number of zeros seen so far)
+    """
+    with open(index_file, "rb") as index:
+        magic, checkpoint_interval, rotations, input_size, input_mtime_ns = (
+            INDEX_HEADER.unpack(index.read(INDEX_HEADER.size))
+        )
+        if magic != INDEX_MAGIC:
+            raise ValueError(f"{index_file} is not a checkpoint index")
+        input_stat = os.stat(input_file)
+        # An edit that keeps the size of the file still changes its modification time
+        if (input_stat.st_size, input_stat.st_mtime_ns) != (input_size, input_mtime_ns):
+            raise ValueError(f"{index_file} is out of date with {input_file}")
+        if not 0 <= rotation <= rotations:
+            raise ValueError(
+                f"rotation must be between 0 and {rotations}, got {rotation}"
+            )
+
+        checkpoint = rotation // checkpoint_interval
+        index.seek(INDEX_HEADER.size + checkpoint * INDEX_RECORD.size)
+        dial_position, number_of_zeros_seen, offset = INDEX_RECORD.unpack(
+            index.read(INDEX_RECORD.size)
+        )
+
+    with open(input_file, "rb") as file:
+        file.seek(offset)
+        for _ in range(rotation - checkpoint * checkpoint_interval):
+            line = file.readline()
+            dial_position, zeros = apply_rotation(
+                dial_position, line[:1].decode(), int(line[1:])
+            )
+            number_of_zeros_seen += zeros
+
+    return dial_position, number_of_zeros_seen
+
+
+class LiveDial:
+    """Running dial state, updated with batches of rotation lines as they arrive."""
+
+    def __init__(self, dial_position: int = STARTING_POSITION):
+        self.dial_position = dial_position
+        self.number_of_zeros_seen = 0
+        self.rotations = 0
+
+    def apply(self, lines: list[bytes]) -> None:
+        """Apply a batch of rotation lines (e.g. b"L68"), skipping blank lines."""
+        dial_position = self.dial_position
+        number_of_zeros_seen = self.number_of_zeros_seen
+        rotations = self.rotations
+        for line in lines:
+            line = line.strip()
+            if not line:
+                continue
+            dial_position, zeros = apply_rotation(
+                dial_position, chr(line[0]), int(line[1:])
+            )
+            number_of_zeros_seen += zeros
+            rotations += 1
+        self.dial_position = dial_position
+        self.number_of_zeros_seen = number_of_zeros_seen
+        self.rotations = rotations
+
+    def __repr__(self) -> str:
+        return f"rotations: {self.rotations}, dial_position: {self.dial_position}, number_of_zeros_seen: {self.number_of_zeros_seen}"
+
+
+# Rotations are read and applied in batches of up to this many bytes
+LIVE_CHUNK_SIZE = 1 << 16
+
+
+async def ingest_stream(
+    reader: asyncio.StreamReader, dial: LiveDial, chunk_size: int = LIVE_CHUNK_SIZE
+) -> None:
+    """Apply rotations from a stream to the dial until the stream ends.
+
+    Args:
+        reader: Stream of rotation lines
+        dial: The dial to update
+        chunk_size: Maximum number of bytes read per batch
+    """
+    pending = b""
+    while chunk := await reader.read(chunk_size):
+        lines = (pending + chunk).split(b"\n")
+        # The last piece is a partial line until its newline arrives
+        pending = lines.pop()
+        dial.apply(lines)
+    dial.apply([pending])
+
+
+async def tail_file(
+    path: str,
+    dial: LiveDial,
+    poll_interval: float = 0.1,
+    chunk_size: int = LIVE_CHUNK_SIZE,
+) -> None:
+    """Apply the rotations of a file to the dial, then keep following appended rotations.
 
-            if dial_position == 0:
-                number_of_zeros_seen += 1
+    Args:
+        path: Path to the file of rotations
+        dial: The dial to update
+        poll_interval: Seconds to wait before checking the file again when at its end
+        chunk_size: Maximum number of bytes read per batch
+    """
+    pending = b""
+    with open(path, "rb") as file:
+        while True:
+            chunk = file.read(chunk_size)
+            if not chunk:
+                await asyncio.sleep(poll_interval)
+                continue
+            lines = (pending + chunk).split(b"\n")
+            pending = lines.pop()
+            dial.apply(lines)
+            # Let the publisher run between batches
+            await asyncio.sleep(0)
 
-            print("dial_position: ", dial_position)
-            print("number_of_zeros_seen: ", number_of_zeros_seen)
 
+async def serve_unix_socket(path: str, dial: LiveDial) -> None:
+    """Apply the rotations sent by every client of a Unix socket to the dial.
+
+    Args:
+        path: Path of the Unix socket to listen on
+        dial: The dial to update
+    """
+
+    async def handle_client(reader, writer):
+        await ingest_stream(reader, dial)
+        writer.close()
+
+    server = await asyncio.start_unix_server(handle_client, path)
+    async with server:
+        await server.serve_forever()
+
+
+async def publish_periodically(dial: LiveDial, interval: float, publish) -> None:
+    """Call publish(dial) every interval seconds."""
+    while True:
+        await asyncio.sleep(interval)
+        publish(dial)
+
+
+async def run_live(source, dial: LiveDial, interval: float = 1.0, publish=print) -> LiveDial:
+    """Run an ingest coroutine while publishing the dial state at a fixed interval.
+
+    Args:
+        source: Coroutine that feeds the dial (e.g. ingest_stream(reader, dial))
+        dial: The dial fed by source
+        interval: Seconds between two publications
+        publish: Function called with the dial to publish its state
+
+    Returns:
+        The dial, once the source is exhausted
+    """
+    publisher = asyncio.create_task(publish_periodically(dial, interval, publish))
+    try:
+        await source
+    finally:
+        publisher.cancel()
+        publish(dial)
+    return dial
+
+
+async def open_stdin() -> asyncio.StreamReader:
+    """Return a StreamReader reading from standard input (e.g. a pipe)."""
+    loop = asyncio.get_running_loop()
+    reader = asyncio.StreamReader()
+    await loop.connect_read_pipe(
+        lambda: asyncio.StreamReaderProtocol(reader), sys.stdin.buffer
+    )
+    return reader
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Description of your program")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--input", help="Input file")
+    source.add_argument(
+        "--stdin",
+        action="store_true",
+        help="Read rotations from standard input as they arrive (e.g. from a pipe)",
+    )
+    source.add_argument(
+        "--follow",
+        help="Read the rotations of a file and keep following rotations appended to it",
+    )
+    source.add_argument(
+        "--socket",
+        help="Listen on this Unix socket for rotations sent by clients",
+    )
+    parser.add_argument(
+        "--interval",
+        type=float,
+        default=1.0,
+        help="Seconds between two reports of the running count in live modes (default: 1.0)",
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Print phase timings and operation counts as JSON to stderr",
+    )
+    parser.add_argument(
+        "--all-starting-positions",
+        action="store_true",
+        help="Print the number of zeros seen for every starting position of the dial",
+    )
+    parser.add_argument(
+        "--dial-size",
+        type=int,
+        default=DIAL_SIZE,
+        help=f"Number of positions on the dial for --all-starting-positions (default: {DIAL_SIZE})",
+    )
+    parser.add_argument(
+        "--index",
+        help="Checkpoint index file (default: the input file with .idx appended)",
+    )
+    parser.add_argument(
+        "--build-index",
+        action="store_true",
+        help="Write a checkpoint index of the dial state for --query",
+    )
+    parser.add_argument(
+        "--checkpoint-interval",
+        type=int,
+        default=1000,
+        help="Number of rotations between checkpoints of the index (default: 1000)",
+    )
+    parser.add_argument(
+        "--query",
+        type=int,
+        nargs="+",
+        help="Print the dial state after these rotations, using the checkpoint index",
+    )
+    args = vars(parser.parse_args())
+
+    if args["input"] is None:
+        if args["build_index"] or args["query"] or args["all_starting_positions"]:
+            parser.error(
+                "--build-index, --query and --all-starting-positions require --input"
+            )
+
+        async def live():
+            dial = LiveDial()
+            if args["stdin"]:
+                ingest = ingest_stream(await open_stdin(), dial)
+            elif args["follow"]:
+                ingest = tail_file(args["follow"], dial)
+            else:
+                ingest = serve_unix_socket(args["socket"], dial)
+            await run_live(
+                ingest, dial, args["interval"], lambda dial: print(dial, flush=True)
+            )
+
+        try:
+            asyncio.run(live())
+        except KeyboardInterrupt:
+            pass
+        return
+
+    if args["all_starting_positions"]:
+        zeros = count_zeros_for_all_starting_positions(
+            args["input"], args["dial_size"]
+        )
+        for starting_position, number_of_zeros_seen in enumerate(zeros):
+            print(
+                f"starting position {starting_position}: number_of_zeros_seen: {number_of_zeros_seen}"
+            )
+        return
+
+    index_file = args["index"] or args["input"] + ".idx"
+    if args["build_index"] or args["query"]:
+        if args["build_index"]:
+            rotations = build_checkpoint_index(
+                args["input"], index_file, args["checkpoint_interval"]
+            )
+            print(f"Indexed {rotations} rotations in {index_file}")
+        for rotation in args["query"] or []:
+            dial_position, number_of_zeros_seen = query_dial_state(
+                args["input"], index_file, rotation
+            )
+            print(
+                f"rotation {rotation}: dial_position: {dial_position}, number_of_zeros_seen: {number_of_zeros_seen}"
+            )
+        return
+
+    stats = {"phases": {}, "counters": {}} if args["profile"] else None
+
+    number_of_zeros_seen = count_zeros_seen(args["input"], verbose=True, stats=stats)
+
+    start = time.perf_counter()
     print("Number of zeros seen: ", number_of_zeros_seen)
 
+    if stats is not None:
+        stats["phases"]["output"] = time.perf_counter() - start
+        print(json.dumps({"day": "day1", **stats}), file=sys.stderr)
+
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,105 @@
+import asyncio
+import os
+
+import pytest
+from main import LiveDial, apply_rotation, build_checkpoint_index, count_zeros_for_all_starting_positions, count_zeros_seen, ingest_stream, query_dial_state, run_live
+
+
+TEST_CASES = [
+    {
+        "input_file": "test_input.txt",
+        "expected_zeros": 6,
+    },
+    {
+        "input_file": "puzzle_input.txt",
+        "expected_zeros": 6475,
+    },
+]
+
+
+@pytest.mark.parametrize("test_case", TEST_CASES)
+def test_count_zeros_seen(test_case):
+    """Test count_zeros_seen function."""
+    zeros = count_zeros_seen(test_case["input_file"])
+    assert zeros == test_case["expected_zeros"], (
+        f"File '{test_case['input_file']}': "
+        f"expected zeros={test_case['expected_zeros']}, got {zeros}"
+    )
+
+
+@pytest.mark.parametrize("checkpoint_interval", [1, 7, 1000])
+def test_query_dial_state(tmp_path, checkpoint_interval):
+    """Test that indexed queries match replaying the rotations from the start."""
+    index_file = str(tmp_path / "puzzle_input.idx")
+    rotations = build_checkpoint_index("puzzle_input.txt", index_file, checkpoint_interval)
+
+    dial_position, number_of_zeros_seen = 50, 0
+    expected_states = [(dial_position, number_of_zeros_seen)]
+    with open("puzzle_input.txt", "r") as file:
+        for line in file:
+            dial_position, zeros = apply_rotation(dial_position, line[0], int(line[1:]))
+            number_of_zeros_seen += zeros
+            expected_states.append((dial_position, number_of_zeros_seen))
+
+    assert rotations == len(expected_states) - 1
+    for rotation in [0, 1, checkpoint_interval, 999, 1001, rotations]:
+        assert query_dial_state("puzzle_input.txt", index_file, rotation) == expected_states[rotation]
+
+
+def test_query_dial_state_rejects_edited_input(tmp_path):
+    """Test that an edit keeping the size of the input invalidates the index."""
+    input_file = tmp_path / "rotations.txt"
+    index_file = str(tmp_path / "rotations.idx")
+    input_file.write_text("L68\nL30\nR48\n")
+    build_checkpoint_index(str(input_file), index_file, 1)
+    assert query_dial_state(str(input_file), index_file, 1) == (82, 1)
+
+    stat = input_file.stat()
+    input_file.write_text("R68\nL30\nR48\n")
+    # Make sure the modification time differs even on coarse-grained filesystems
+    os.utime(input_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    with pytest.raises(ValueError, match="out of date"):
+        query_dial_state(str(input_file), index_file, 1)
+
+
+@pytest.mark.parametrize("test_case", TEST_CASES)
+def test_live_ingest(test_case):
+    """Test that rotations arriving in arbitrary pieces give the same count as the file."""
+    with open(test_case["input_file"], "rb") as f:
+        content = f.read()
+
+    async def ingest():
+        reader = asyncio.StreamReader()
+        # Split the input so that chunks end in the middle of lines
+        for start in range(0, len(content), 7):
+            reader.feed_data(content[start : start + 7])
+        reader.feed_eof()
+        dial = LiveDial()
+        published = []
+        await run_live(ingest_stream(reader, dial, chunk_size=5), dial, 60, published.append)
+        return dial, published
+
+    dial, published = asyncio.run(ingest())
+    assert dial.number_of_zeros_seen == test_case["expected_zeros"]
+    assert published == [dial]
+
+
+@pytest.mark.parametrize("test_case", TEST_CASES)
+@pytest.mark.parametrize("dial_size", [100, 7])
+def test_count_zeros_for_all_starting_positions(test_case, dial_size):
+    """Test the single-pass table against replaying the rotations from every starting position."""
+    with open(test_case["input_file"], "r") as file:
+        rotations = [(line[0], int(line[1:])) for line in file]
+
+    expected = []
+    for starting_position in range(dial_size):
+        dial_position, number_of_zeros_seen = starting_position, 0
+        for direction, steps in rotations:
+            dial_position, zeros = apply_rotation(dial_position, direction, steps, dial_size=dial_size)
+            number_of_zeros_seen += zeros
+        expected.append(number_of_zeros_seen)
+
+    zeros = count_zeros_for_all_starting_positions(test_case["input_file"], dial_size)
+    assert zeros == expected
+    if dial_size == 100:
+        assert zeros[50] == test_case["expected_zeros"]
@@ -1,7 +1,16 @@
 import argparse
+import json
+import struct
+import sys
+import time
+from array import array
+from bisect import bisect_left, bisect_right
+from typing import Iterable, Iterator
 
 
 class Range:
+    __slots__ = ("original_start", "original_end")
+
     def __init__(self, start: int, end: int):
         # Store original values
         self.original_start = start
@@ -94,6 +103,100 @@ def all_components_same(components: list[int]) -> bool:
     return all(component == first for component in components)
 
 
+def repeated_block_ids(num_digits: int) -> list[int]:
+    """Return the sorted IDs of num_digits digits made of a block repeated at least twice.
+
+    Examples:
+        2 -> [11, 22, ..., 99]
+        4 -> [1010, 1111, 1212, ..., 9999]
+    """
+    ids = set()
+    for set_size in range(1, num_digits // 2 + 1):
+        if num_digits % set_size != 0:
+            continue
+        # Repeating a block multiplies it by 1, 10^set_size, 10^(2 * set_size), ...
+        multiplier = sum(10 ** (set_size * i) for i in range(num_digits // set_size))
+        first_block = 10 ** (set_size - 1)
+        ids.update(range(first_block * multiplier, 10**set_size * multiplier, multiplier))
+    return sorted(ids)
+
+
+# Index file layout: a header (magic, max digits, number of IDs) followed by
+# the sorted IDs and their prefix sums, as little-endian 64-bit integers
+INDEX_MAGIC = b"D2P2IDX\0"
+INDEX_HEADER = struct.Struct("<8sqq")
+
+
+class InvalidIdIndex:
+    """Sorted invalid IDs up to a number of digits, with prefix sums for range queries."""
+
+    __slots__ = ("max_digits", "ids", "prefix_sums")
+
+    def __init__(self, max_digits: int, ids: array, prefix_sums: array):
+        self.max_digits = max_digits
+        self.ids = ids
+        # prefix_sums[i] is the sum of the first i IDs
+        self.prefix_sums = prefix_sums
+
+    @classmethod
+    def build(cls, max_digits: int) -> "InvalidIdIndex":
+        """Enumerate every invalid ID with at most max_digits digits."""
+        ids = array("q")
+        prefix_sums = array("q", [0])
+        running_sum = 0
+        try:
+            for num_digits in range(2, max_digits + 1):
+                ids.extend(repeated_block_ids(num_digits))
+            for number in ids:
+                running_sum += number
+                prefix_sums.append(running_sum)
+        except OverflowError:
+            raise ValueError(
+                f"The invalid IDs up to {max_digits} digits or their sum do not fit in 64 bits"
+            ) from None
+        return cls(max_digits, ids, prefix_sums)
+
+    @classmethod
+    def load(cls, path: str) -> "InvalidIdIndex":
+        """Load an index written by save()."""
+        with open(path, "rb") as f:
+            magic, max_digits, count = INDEX_HEADER.unpack(f.read(INDEX_HEADER.size))
+            if magic != INDEX_MAGIC:
+                raise ValueError(f"{path} is not an invalid ID index")
+            ids = array("q")
+            ids.fromfile(f, count)
+            prefix_sums = array("q")
+            prefix_sums.fromfile(f, count + 1)
+        if sys.byteorder == "big":
+            ids.byteswap()
+            prefix_sums.byteswap()
+        return cls(max_digits, ids, prefix_sums)
+
+    def save(self, path: str) -> None:
+        """Write the index to a file."""
+        ids = array("q", self.ids)
+        prefix_sums = array("q", self.prefix_sums)
+        if sys.byteorder == "big":
+            ids.byteswap()
+            prefix_sums.byteswap()
+        with open(path, "wb") as f:
+            f.write(INDEX_HEADER.pack(INDEX_MAGIC, self.max_digits, len(ids)))
+            ids.tofile(f)
+            prefix_sums.tofile(f)
+
+    def covers(self, number: int) -> bool:
+        """Check if the index holds every invalid ID up to number."""
+        return number < 10**self.max_digits
+
+    def find(self, first: int, last: int) -> tuple[int, int]:
+        """Return the (start, stop) positions of the IDs between first and last (inclusive)."""
+        return bisect_left(self.ids, first), bisect_right(self.ids, last)
+
+    def sum_between(self, start: int, stop: int) -> int:
+        """Return the sum of the IDs at positions start to stop (exclusive)."""
+        return self.prefix_sums[stop] - self.prefix_sums[start]
+
+
 def parse_ranges(content: str) -> list[Range]:
     ranges = []
     parts = content.strip().split(",")
@@ -103,20 +206,105 @@ def parse_ranges(content: str) -> list[Range]:
     return ranges
 
 
-def calculate_sum_of_invalid_ids(content: str, verbose: bool = False) -> int:
-    """Calculate the sum of invalid IDs from the given content.
+# Range files are read in chunks of this many characters
+RANGE_CHUNK_SIZE = 1 << 16
+
+
+def iter_ranges(
+    file, chunk_size: int = RANGE_CHUNK_SIZE, stats: dict | None = None
+) -> Iterator[Range]:
+    """Yield the ranges of a comma-separated range file, reading it in chunks.
+
+    Only one chunk and the ranges it holds are kept in memory, so files of any
+    size can be processed.
 
     Args:
-        content: The input string containing comma-separated ranges
+        file: Open text file containing comma-separated ranges
+        chunk_size: Number of characters read at a time
+        stats: If given, a {"phases": {}, "counters": {}} dictionary to which
+            the time spent reading and tokenizing chunks and the number of
+            ranges are added
+
+    Yields:
+        Each Range, in file order
+    """
+    if stats is not None:
+        stats["phases"].setdefault("parse", 0.0)
+        stats["counters"].setdefault("ranges", 0)
+    pending = ""
+    while True:
+        if stats is not None:
+            start = time.perf_counter()
+        chunk = file.read(chunk_size)
+        if chunk:
+            parts = (pending + chunk).split(",")
+            # The last part may continue in the next chunk
+            pending = parts.pop()
+        else:
+            parts = [pending] if pending.strip() else []
+        ranges = []
+        for part in parts:
+            start_id, end_id = map(int, part.split("-"))
+            ranges.append(Range(start_id, end_id))
+        if stats is not None:
+            # Ranges are tokenized a chunk at a time so that only this is timed
+            stats["phases"]["parse"] += time.perf_counter() - start
+            stats["counters"]["ranges"] += len(ranges)
+        yield from ranges
+        if not chunk:
+            return
+
+
+def sum_invalid_ids(
+    ranges: Iterable[Range],
+    verbose: bool = False,
+    stats: dict | None = None,
+    index: InvalidIdIndex | None = None,
+) -> int:
+    """Sum the invalid IDs of ranges, consuming them one at a time.
+
+    Args:
+        ranges: Iterable of ranges, e.g. a list or the generator returned by iter_ranges
         verbose: If True, print debug information
+        stats: If given, a {"phases": {}, "counters": {}} dictionary that is
+            filled with the time spent computing and printing the result, and
+            with the number of candidate IDs tested
+        index: If given, ranges it covers are answered from the index
+            instead of testing every number
 
     Returns:
         The sum of all invalid IDs
     """
-    ranges = parse_ranges(content)
+    total = 0
+    # Only kept to be printed in verbose mode; otherwise memory doesn't grow with the input
     invalid_ids = []
 
+    if stats is not None:
+        start = time.perf_counter()
+        parse_seconds = stats["phases"].get("parse", 0.0)
+        stats["counters"]["indexed_ranges"] = 0
+        stats["counters"]["candidates_tested"] = 0
+
     for range in ranges:
+        if range.first() > range.last():
+            # A reversed range is empty, and the index would give a negative sum for it
+            continue
+
+        if index is not None and index.covers(range.last()):
+            start_position, stop_position = index.find(range.first(), range.last())
+            total += index.sum_between(start_position, stop_position)
+            if verbose:
+                for number in index.ids[start_position:stop_position]:
+                    print(f"Number {number} is invalid")
+                    invalid_ids.append(number)
+            if stats is not None:
+                stats["counters"]["indexed_ranges"] += 1
+            continue
+
+        if stats is not None:
+            # Every number of the range is tested
+            stats["counters"]["candidates_tested"] += range.last() - range.first() + 1
+
         current_number = range.first()
         while current_number <= range.last():
             for size in valid_set_sizes(current_number):
@@ -124,29 +312,138 @@ def calculate_sum_of_invalid_ids(content: str, verbose: bool = False) -> int:
                 if all_components_same(components):
                     if verbose:
                         print(f"Number {current_number} is invalid")
-                    invalid_ids.append(current_number)
+                        invalid_ids.append(current_number)
+                    total += current_number
                     break
 
             current_number = current_number + 1
 
+    if stats is not None:
+        computed = time.perf_counter()
+        # Time spent producing the ranges while iterating is counted as parsing
+        stats["phases"]["compute"] = (
+            computed - start - (stats["phases"].get("parse", 0.0) - parse_seconds)
+        )
+
     if verbose:
         print(f"Invalid IDs: {invalid_ids}")
-        print(f"Sum of invalid IDs: {sum(invalid_ids)}")
 
-    return sum(invalid_ids)
+    if stats is not None:
+        stats["phases"]["output"] = time.perf_counter() - computed
+
+    return total
+
+
+def calculate_sum_of_invalid_ids(
+    content: str,
+    verbose: bool = False,
+    stats: dict | None = None,
+    index: InvalidIdIndex | None = None,
+) -> int:
+    """Calculate the sum of invalid IDs from the given content.
+
+    Args:
+        content: The input string containing comma-separated ranges
+        verbose: If True, print debug information
+        stats: If given, a {"phases": {}, "counters": {}} dictionary that is
+            filled with the time spent parsing, computing and printing the
+            result, and with the number of ranges and candidate IDs tested
+        index: If given, ranges it covers are answered from the index
+            instead of testing every number
+
+    Returns:
+        The sum of all invalid IDs
+    """
+    if stats is not None:
+        start = time.perf_counter()
+    ranges = parse_ranges(content)
+    if stats is not None:
+        stats["phases"]["parse"] = stats["phases"].get("parse", 0.0) + time.perf_counter() - start
+        stats["counters"]["ranges"] = len(ranges)
+
+    return sum_invalid_ids(ranges, verbose, stats, index)
+
+
+def calculate_sum_of_invalid_ids_from_file(
+    input_file: str,
+    verbose: bool = False,
+    stats: dict | None = None,
+    index: InvalidIdIndex | None = None,
+    chunk_size: int = RANGE_CHUNK_SIZE,
+) -> int:
+    """Calculate the sum of invalid IDs of a range file, streaming its ranges.
+
+    Args:
+        input_file: Path to the file of comma-separated ranges
+        verbose: If True, print debug information
+        stats: If given, a {"phases": {}, "counters": {}} dictionary that is
+            filled with the time spent parsing, computing and printing the
+            result, and with the number of ranges and candidate IDs tested
+        index: If given, ranges it covers are answered from the index
+            instead of testing every number
+        chunk_size: Number of characters read at a time
+
+    Returns:
+        The sum of all invalid IDs
+    """
+    with open(input_file, "r") as f:
+        return sum_invalid_ids(iter_ranges(f, chunk_size, stats), verbose, stats, index)
 
 
 def main():
     parser = argparse.ArgumentParser(description="Advent of Code Day 2 Part 2")
+    parser.add_argument("--input", type=str, help="Path to the input file")
+    parser.add_argument(
+        "-v",
+        "--verbose",
+        action="store_true",
+        help="Print every range and invalid ID (memory then grows with the input)",
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Print phase timings and operation counts as JSON to stderr",
+    )
+    parser.add_argument(
+        "--index",
+        type=str,
+        help="Answer ranges from an index of invalid IDs written by --build-index",
+    )
     parser.add_argument(
-        "--input", type=str, required=True, help="Path to the input file"
+        "--build-index",
+        type=str,
+        metavar="PATH",
+        help="Write an index of every invalid ID up to --max-digits digits to PATH and exit",
+    )
+    parser.add_argument(
+        "--max-digits",
+        type=int,
+        default=12,
+        help="Number of digits covered by --build-index (default: 12)",
     )
     args = parser.parse_args()
 
-    with open(args.input, "r") as f:
-        content = f.read()
+    if args.build_index:
+        index = InvalidIdIndex.build(args.max_digits)
+        index.save(args.build_index)
+        print(f"Indexed {len(index.ids)} invalid IDs up to {args.max_digits} digits in {args.build_index}")
+        return
+    if not args.input:
+        parser.error("--input is required")
+
+    index = InvalidIdIndex.load(args.index) if args.index else None
+
+    stats = {"phases": {}, "counters": {}} if args.profile else None
+
+    total = calculate_sum_of_invalid_ids_from_file(
+        args.input, verbose=args.verbose, stats=stats, index=index
+    )
+    start = time.perf_counter()
+    print(f"Sum of invalid IDs: {total}")
 
-    calculate_sum_of_invalid_ids(content, verbose=True)
+    if stats is not None:
+        stats["phases"]["output"] = stats["phases"].get("output", 0.0) + time.perf_counter() - start
+        print(json.dumps({"day": "day2_part2", **stats}), file=sys.stderr)
 
 
 if __name__ == "__main__":
@@ -1,7 +1,15 @@
 """Test suite for main.py to verify correctness of optimizations."""
 
+import io
+
 import pytest
-from main import calculate_sum_of_invalid_ids
+from main import (
+    InvalidIdIndex,
+    calculate_sum_of_invalid_ids,
+    calculate_sum_of_invalid_ids_from_file,
+    iter_ranges,
+    parse_ranges,
+)
 
 # Dictionary mapping input files to their expected sum of invalid IDs
 EXPECTED_RESULTS = {
@@ -19,3 +27,48 @@ def test_sum_of_invalid_ids(input_file, expected_sum):
 
     result = calculate_sum_of_invalid_ids(content)
     assert result == expected_sum, f"Expected {expected_sum}, got {result}"
+
+
+@pytest.fixture(scope="module")
+def index(tmp_path_factory):
+    """Index of every invalid ID up to 10 digits, saved and loaded back."""
+    path = str(tmp_path_factory.mktemp("index") / "invalid_ids.idx")
+    InvalidIdIndex.build(10).save(path)
+    return InvalidIdIndex.load(path)
+
+
+@pytest.mark.parametrize("input_file,expected_sum", EXPECTED_RESULTS.items())
+def test_sum_of_invalid_ids_with_index(input_file, expected_sum, index):
+    """Test that answering ranges from the index matches the baseline."""
+    with open(input_file, "r") as f:
+        content = f.read()
+
+    stats = {"phases": {}, "counters": {}}
+    result = calculate_sum_of_invalid_ids(content, stats=stats, index=index)
+    assert result == expected_sum, f"Expected {expected_sum}, got {result}"
+    assert stats["counters"]["candidates_tested"] == 0
+
+
+def test_reversed_range_with_index():
+    """Test that a reversed range is empty whether or not the index answers it."""
+    index = InvalidIdIndex.build(4)
+    assert calculate_sum_of_invalid_ids("30-20") == 0
+    assert calculate_sum_of_invalid_ids("30-20", index=index) == 0
+    assert calculate_sum_of_invalid_ids("30-20,11-22", index=index) == calculate_sum_of_invalid_ids("11-22")
+
+
+@pytest.mark.parametrize("input_file,expected_sum", EXPECTED_RESULTS.items())
+def test_sum_of_invalid_ids_from_file(input_file, expected_sum):
+    """Test that streaming the ranges from the file matches the baseline."""
+    result = calculate_sum_of_invalid_ids_from_file(input_file, chunk_size=5)
+    assert result == expected_sum, f"Expected {expected_sum}, got {result}"
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 3, 7, 1 << 16])
+def test_iter_ranges_across_chunk_boundaries(chunk_size):
+    """Test that ranges split across chunks are tokenized like parse_ranges."""
+    with open("puzzle_input.txt", "r") as f:
+        content = f.read()
+
+    streamed = list(iter_ranges(io.StringIO(content), chunk_size))
+    assert [repr(range) for range in streamed] == [repr(range) for range in parse_ranges(content)]
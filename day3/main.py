@@ -1,8 +1,40 @@
 import argparse
+import json
+import os
+import sys
+import time
 from dataclasses import dataclass
 from re import S
 from typing import List, Tuple
 
+import numpy as np
+
+
+def timed(iterable, stats: dict, phase: str, counter: str | None = None):
+    """
+    Yield the items of iterable while profiling it.
+    
+    The time spent producing the items is added to stats["phases"][phase] and,
+    if counter is given, the number of items to stats["counters"][counter].
+    """
+    phases = stats["phases"]
+    counters = stats["counters"]
+    phases.setdefault(phase, 0.0)
+    if counter is not None:
+        counters.setdefault(counter, 0)
+    iterator = iter(iterable)
+    while True:
+        start = time.perf_counter()
+        try:
+            item = next(iterator)
+        except StopIteration:
+            phases[phase] += time.perf_counter() - start
+            return
+        phases[phase] += time.perf_counter() - start
+        if counter is not None:
+            counters[counter] += 1
+        yield item
+
 
 @dataclass
 class NumberWithPosition:
@@ -72,13 +104,18 @@ def find_max_valid_battery(
     return max_index
 
 
-def process_bank_line(line: str, num_batteries: int = 2) -> List[int]:
+def process_bank_line(
+    line: str, num_batteries: int = 2, verbose: bool = False, stats: dict | None = None
+) -> List[int]:
     """
     Process a single bank line and return the enabled battery values.
     
     Args:
         line: A string of digits representing a battery bank
         num_batteries: Number of batteries to enable (default: 2)
+        verbose: If True, print each battery as it is enabled
+        stats: If given, a {"phases": {}, "counters": {}} dictionary whose counters
+               are increased by the find_max_valid_battery scans and batteries compared
         
     Returns:
         A list of battery values in order
@@ -100,30 +137,301 @@ def process_bank_line(line: str, num_batteries: int = 2) -> List[int]:
         enabled_batteries.append(valid_battery)
         bank.sorted_order.pop(battery_index)
         minimum_original_position = valid_battery.original_position
-        print(f"Added battery: {valid_battery.value} at position {valid_battery.original_position} in original order")
+        if verbose:
+            print(f"Added battery: {valid_battery.value} at position {valid_battery.original_position} in original order")
 
     if len(enabled_batteries) != num_batteries:
         raise ValueError(f"Expected {num_batteries} batteries, got {len(enabled_batteries)}")
     
+    if stats is not None:
+        # Scan j compares every battery left in sorted_order, which shrinks by one per scan
+        counters = stats["counters"]
+        counters["find_max_valid_battery_scans"] = counters.get("find_max_valid_battery_scans", 0) + num_batteries
+        counters["batteries_compared"] = counters.get("batteries_compared", 0) + (
+            num_batteries * bank.num_elements - num_batteries * (num_batteries - 1) // 2
+        )
+    
     sorted_enabled_batteries = sorted(enabled_batteries, key=lambda x: x.original_position)
     return [battery.value for battery in sorted_enabled_batteries]
 
-def process_file(input_file: str, num_batteries: int = 2) -> int:
+def process_file(input_file: str, num_batteries: int = 2, stats: dict | None = None) -> int:
     """
     Process an input file and return the total joltage.
     
     Args:
         input_file: Path to the input file
         num_batteries: Number of batteries to enable (default: 2)
+        stats: If given, a {"phases": {}, "counters": {}} dictionary that is filled
+               with the time spent reading the input and computing, and with the
+               number of lines read and find_max_valid_battery scans
         
     Returns:
         Total joltage across all banks
     """
     total_battery_value = 0
     with open(input_file, "r") as f:
-        for line in f:
+        lines = f
+        if stats is not None:
+            start = time.perf_counter()
+            lines = timed(f, stats, "parse", counter="lines")
+        
+        for line in lines:
             if line.strip():  # Skip empty lines
-                enabled_batteries = process_bank_line(line, num_batteries)
+                enabled_batteries = process_bank_line(line, num_batteries, stats=stats)
+                
+                # Calculate joltage: each battery contributes its value * 10^(position from right)
+                joltage = 0
+                for i, battery_value in enumerate(enabled_batteries):
+                    power = len(enabled_batteries) - 1 - i
+                    joltage += battery_value * (10 ** power)
+                
+                total_battery_value += joltage
+    
+    if stats is not None:
+        stats["phases"]["compute"] = time.perf_counter() - start - stats["phases"]["parse"]
+    
+    return total_battery_value
+
+
+def load_bank_matrix(input_file: str) -> np.ndarray:
+    """
+    Load banks of identical length into a (banks x digits) matrix.
+    
+    Args:
+        input_file: Path to the input file
+        
+    Returns:
+        A uint8 matrix where row i holds the digits of bank i
+    """
+    with open(input_file, "rb") as f:
+        banks = f.read().split()
+    
+    if not banks:
+        return np.zeros((0, 0), dtype=np.uint8)
+    num_elements = len(banks[0])
+    if any(len(bank) != num_elements for bank in banks):
+        raise ValueError("Batch mode requires all banks to have the same length")
+    
+    matrix = np.frombuffer(b"".join(banks), dtype=np.uint8).reshape(len(banks), num_elements) - ord("0")
+    # Bytes below "0" wrap around, so anything but a digit ends up above 9
+    if (matrix > 9).any():
+        raise ValueError("Banks contain non-digit bytes")
+    return matrix
+
+
+def select_batteries_batch(matrix: np.ndarray, num_batteries: int = 2) -> np.ndarray:
+    """
+    Enable num_batteries batteries in every bank at once.
+    
+    Makes the same choices as process_bank_line: the j-th battery is the largest
+    (leftmost on ties) after the previous one that leaves enough batteries after it.
+    Each step is one argmax over the allowed window of every row.
+    
+    Args:
+        matrix: A (banks x digits) matrix, as returned by load_bank_matrix
+        num_batteries: Number of batteries to enable (default: 2)
+        
+    Returns:
+        A (banks x num_batteries) matrix of the enabled battery values, in order
+    """
+    num_banks, num_elements = matrix.shape
+    if num_batteries > num_elements:
+        raise ValueError(f"No valid battery found for {num_batteries} batteries")
+    
+    rows = np.arange(num_banks)
+    columns = np.arange(num_elements)
+    # First position each bank may pick from
+    minimum_position = np.zeros(num_banks, dtype=np.intp)
+    enabled_batteries = np.empty((num_banks, num_batteries), dtype=np.uint8)
+    
+    for j in range(num_batteries):
+        # The battery must leave num_batteries - j - 1 batteries after it
+        first = int(minimum_position.min()) if num_banks else 0
+        last = num_elements - num_batteries + j
+        window = matrix[:, first : last + 1].astype(np.int16)
+        window[columns[first : last + 1] < minimum_position[:, None]] = -1
+        
+        positions = first + np.argmax(window, axis=1)
+        enabled_batteries[:, j] = matrix[rows, positions]
+        minimum_position = positions + 1
+    
+    return enabled_batteries
+
+
+def process_file_batch(
+    input_file: str, num_batteries: int = 2, stats: dict | None = None
+) -> tuple[list[int], int]:
+    """
+    Process an input file of equal-length banks as one matrix.
+    
+    Args:
+        input_file: Path to the input file
+        num_batteries: Number of batteries to enable (default: 2)
+        stats: If given, a {"phases": {}, "counters": {}} dictionary that is filled
+               with the time spent loading the matrix and computing, and with the
+               number of banks
+        
+    Returns:
+        Tuple of (joltage of each bank, total joltage across all banks)
+    """
+    if stats is not None:
+        start = time.perf_counter()
+    
+    matrix = load_bank_matrix(input_file)
+    
+    if stats is not None:
+        parsed = time.perf_counter()
+        stats["phases"]["parse"] = parsed - start
+        stats["counters"]["lines"] = len(matrix)
+    
+    if len(matrix) == 0:  # No banks, like process_file
+        if stats is not None:
+            stats["phases"]["compute"] = 0.0
+        return [], 0
+    enabled_batteries = select_batteries_batch(matrix, num_batteries)
+    
+    if num_batteries <= 18:
+        # The joltage fits in 64 bits: each battery contributes its value * 10^(position from right)
+        powers = 10 ** np.arange(num_batteries - 1, -1, -1, dtype=np.int64)
+        joltages = (enabled_batteries.astype(np.int64) @ powers).tolist()
+    else:
+        joltages = [int("".join(map(str, row))) for row in enabled_batteries.tolist()]
+    
+    if stats is not None:
+        stats["phases"]["compute"] = time.perf_counter() - parsed
+    
+    return joltages, sum(joltages)
+
+
+# Banks are read in chunks of this many bytes by the streaming selector
+BANK_CHUNK_SIZE = 1 << 20
+
+
+def bank_spans(input_file: str, chunk_size: int = BANK_CHUNK_SIZE) -> List[Tuple[int, int, int]]:
+    """
+    Locate the digits of every line of a file without holding a whole line in memory.
+    
+    Leading and trailing whitespace, including the carriage return of CRLF line
+    endings, is left out of the digits, like the strip() in process_bank_line.
+    
+    Args:
+        input_file: Path to the input file
+        chunk_size: Number of bytes read at a time
+        
+    Returns:
+        For each line, the number of bytes before its digits, the number of digits
+        and the number of bytes after them, excluding the newline
+    """
+    spans = []
+    # Whitespace bytes before the first digit, bytes from there on and trailing
+    # whitespace bytes of the line being scanned
+    leading = length = trailing = 0
+    
+    def add_segment(segment: bytes) -> None:
+        nonlocal leading, length, trailing
+        if not length:
+            stripped = segment.lstrip()
+            leading += len(segment) - len(stripped)
+            segment = stripped
+        if not segment:
+            return
+        length += len(segment)
+        stripped = segment.rstrip()
+        trailing = trailing + len(segment) if not stripped else len(segment) - len(stripped)
+    
+    with open(input_file, "rb") as f:
+        while chunk := f.read(chunk_size):
+            start = 0
+            while (newline := chunk.find(b"\n", start)) != -1:
+                add_segment(chunk[start:newline])
+                spans.append((leading, length - trailing, trailing))
+                leading = length = trailing = 0
+                start = newline + 1
+            add_segment(chunk[start:])
+    if leading or length:
+        spans.append((leading, length - trailing, trailing))
+    return spans
+
+
+def select_batteries_streaming(
+    stream, num_elements: int, num_batteries: int = 2, chunk_size: int = BANK_CHUNK_SIZE
+) -> List[int]:
+    """
+    Enable batteries of a bank read from a byte stream, keeping only a stack of candidates.
+    
+    A digit pops the smaller candidates before it for as long as enough digits remain to
+    refill the stack, which yields the same batteries as process_bank_line. Memory is
+    O(num_batteries + chunk_size) whatever the length of the bank.
+    
+    Args:
+        stream: Binary stream positioned at the first digit of the bank
+        num_elements: Number of digits in the bank
+        num_batteries: Number of batteries to enable (default: 2)
+        chunk_size: Number of bytes read at a time
+        
+    Returns:
+        A list of battery values in order
+    """
+    if num_batteries > num_elements:
+        raise ValueError(f"No valid battery found for {num_batteries} batteries")
+    
+    # Number of digits that can still be left out of the selection
+    droppable = num_elements - num_batteries
+    # Candidates are kept as ASCII digits, which compare like their values
+    stack = bytearray()
+    remaining = num_elements
+    while remaining:
+        chunk = stream.read(min(chunk_size, remaining))
+        if not chunk:
+            raise ValueError(f"Bank ended after {num_elements - remaining} of {num_elements} digits")
+        remaining -= len(chunk)
+        if not chunk.isdigit():
+            raise ValueError(f"Bank contains non-digit bytes: {chunk!r}")
+        for digit in chunk:
+            while droppable and stack and stack[-1] < digit:
+                stack.pop()
+                droppable -= 1
+            if len(stack) < num_batteries:
+                stack.append(digit)
+            else:
+                droppable -= 1
+    
+    return [digit - ord("0") for digit in stack]
+
+
+def process_file_streaming(
+    input_file: str, num_batteries: int = 2, chunk_size: int = BANK_CHUNK_SIZE, stats: dict | None = None
+) -> int:
+    """
+    Process an input file whose banks may be too large to hold in memory.
+    
+    Args:
+        input_file: Path to the input file
+        num_batteries: Number of batteries to enable (default: 2)
+        chunk_size: Number of bytes read at a time
+        stats: If given, a {"phases": {}, "counters": {}} dictionary that is filled
+               with the time spent locating the banks and selecting their batteries,
+               and with the number of lines read
+        
+    Returns:
+        Total joltage across all banks
+    """
+    if stats is not None:
+        start = time.perf_counter()
+    
+    spans = bank_spans(input_file, chunk_size)
+    
+    if stats is not None:
+        parsed = time.perf_counter()
+        stats["phases"]["parse"] = parsed - start
+        stats["counters"]["lines"] = len(spans)
+    
+    total_battery_value = 0
+    with open(input_file, "rb") as f:
+        for skipped, num_elements, trailing in spans:
+            f.seek(skipped, os.SEEK_CUR)
+            if num_elements:  # Skip empty lines
+                enabled_batteries = select_batteries_streaming(f, num_elements, num_batteries, chunk_size)
                 
                 # Calculate joltage: each battery contributes its value * 10^(position from right)
                 joltage = 0
@@ -132,6 +440,11 @@ def process_file(input_file: str, num_batteries: int = 2) -> int:
                     joltage += battery_value * (10 ** power)
                 
                 total_battery_value += joltage
+            # Skip the trailing whitespace and the newline
+            f.seek(trailing + 1, os.SEEK_CUR)
+    
+    if stats is not None:
+        stats["phases"]["compute"] = time.perf_counter() - parsed
     
     return total_battery_value
 
@@ -150,14 +463,58 @@ def main():
         default=2,
         help="Number of batteries to enable (default: 2)",
     )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Print phase timings and operation counts as JSON to stderr",
+    )
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Read banks in chunks so that memory doesn't grow with their length",
+    )
+    parser.add_argument(
+        "--batch",
+        action="store_true",
+        help="Process all banks at once as a matrix (banks must have the same length)",
+    )
     args = parser.parse_args()
     
+    stats = {"phases": {}, "counters": {}} if args.profile else None
+    
+    if args.stream:
+        total_battery_value = process_file_streaming(args.input, args.batteries, stats=stats)
+        start = time.perf_counter()
+        print(f"\nTotal joltage: {total_battery_value}")
+        
+        if stats is not None:
+            stats["phases"]["output"] = time.perf_counter() - start
+            print(json.dumps({"day": "day3", **stats}), file=sys.stderr)
+        return
+    
+    if args.batch:
+        joltages, total_battery_value = process_file_batch(args.input, args.batteries, stats=stats)
+        start = time.perf_counter()
+        for joltage in joltages:
+            print(f"Joltage: {joltage}")
+        print(f"\nTotal joltage: {total_battery_value}")
+        
+        if stats is not None:
+            stats["phases"]["output"] = time.perf_counter() - start
+            print(json.dumps({"day": "day3", **stats}), file=sys.stderr)
+        return
+    
     total_battery_value = 0
     with open(args.input, "r") as f:
-        for line in f:
+        lines = f
+        if stats is not None:
+            start = time.perf_counter()
+            lines = timed(f, stats, "parse", counter="lines")
+        
+        for line in lines:
             if line.strip():  # Skip empty lines
                 print(f"\nProcessing bank: {line.strip()}")
-                enabled_batteries = process_bank_line(line, args.batteries)
+                enabled_batteries = process_bank_line(line, args.batteries, verbose=True, stats=stats)
                 
                 # Calculate joltage: each battery contributes its value * 10^(position from right)
                 joltage = 0
@@ -169,7 +526,15 @@ def main():
                 print(f"Joltage: {joltage}")
                 total_battery_value += joltage
 
+    if stats is not None:
+        computed = time.perf_counter()
+        stats["phases"]["compute"] = computed - start - stats["phases"]["parse"]
+    
     print(f"\nTotal joltage: {total_battery_value}")
+    
+    if stats is not None:
+        stats["phases"]["output"] = time.perf_counter() - computed
+        print(json.dumps({"day": "day3", **stats}), file=sys.stderr)
 
 if __name__ == "__main__":
     main()
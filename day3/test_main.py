@@ -1,5 +1,13 @@
+import io
+
 import pytest
-from main import process_file
+from main import (
+    process_bank_line,
+    process_file,
+    process_file_batch,
+    process_file_streaming,
+    select_batteries_streaming,
+)
 
 
 TEST_CASES = [
@@ -30,3 +38,103 @@ def test_input_files(test_case):
         f"expected total joltage={test_case['expected_joltage']}, got {total_joltage}"
     )
 
+
+def test_process_file_stats():
+    """Test that profiling counts one find_max_valid_battery scan per enabled battery."""
+    stats = {"phases": {}, "counters": {}}
+    total_joltage = process_file("test_input.txt", 12, stats=stats)
+    assert total_joltage == 3121910778619
+    assert stats["counters"]["lines"] == 4
+    assert stats["counters"]["find_max_valid_battery_scans"] == 4 * 12
+    assert set(stats["phases"]) == {"parse", "compute"}
+
+
+@pytest.mark.parametrize("test_case", TEST_CASES)
+def test_process_file_batch(test_case):
+    """Test that batch mode matches processing the banks one line at a time."""
+    joltages, total_joltage = process_file_batch(test_case["input_file"], test_case["num_batteries"])
+    assert total_joltage == test_case["expected_joltage"]
+
+    with open(test_case["input_file"], "r") as f:
+        expected_joltages = [
+            int("".join(map(str, process_bank_line(line, test_case["num_batteries"]))))
+            for line in f
+            if line.strip()
+        ]
+    assert joltages == expected_joltages
+
+
+def test_process_file_batch_stats(tmp_path):
+    """Test that batch mode fills the same phases as process_file, with or without banks."""
+    stats = {"phases": {}, "counters": {}}
+    assert process_file_batch("test_input.txt", 12, stats=stats)[1] == 3121910778619
+    assert stats["counters"]["lines"] == 4
+    assert set(stats["phases"]) == {"parse", "compute"}
+
+    input_file = tmp_path / "empty.txt"
+    input_file.write_text("\n")
+    stats = {"phases": {}, "counters": {}}
+    assert process_file_batch(str(input_file), stats=stats) == ([], 0)
+    assert stats["counters"]["lines"] == 0
+    assert set(stats["phases"]) == {"parse", "compute"}
+
+
+@pytest.mark.parametrize("test_case", TEST_CASES)
+def test_process_file_streaming(test_case):
+    """Test that streaming banks in small chunks matches processing them as whole lines."""
+    total_joltage = process_file_streaming(
+        test_case["input_file"], test_case["num_batteries"], chunk_size=4
+    )
+    assert total_joltage == test_case["expected_joltage"]
+
+    with open(test_case["input_file"], "r") as f:
+        for line in f:
+            bank = line.strip()
+            enabled_batteries = select_batteries_streaming(
+                io.BytesIO(bank.encode()), len(bank), test_case["num_batteries"], chunk_size=3
+            )
+            assert enabled_batteries == process_bank_line(bank, test_case["num_batteries"])
+
+
+def test_empty_input(tmp_path):
+    """Test that every mode gives a total joltage of 0 for a file without banks."""
+    input_file = tmp_path / "empty.txt"
+    input_file.write_text("\n")
+    assert process_file(str(input_file)) == 0
+    assert process_file_batch(str(input_file)) == ([], 0)
+    assert process_file_streaming(str(input_file)) == 0
+
+
+def test_process_file_streaming_stats():
+    """Test that streaming fills the same phases and line count as process_file."""
+    stats = {"phases": {}, "counters": {}}
+    assert process_file_streaming("test_input.txt", 12, chunk_size=4, stats=stats) == 3121910778619
+    assert stats["counters"]["lines"] == 4
+    assert set(stats["phases"]) == {"parse", "compute"}
+
+
+@pytest.mark.parametrize("test_case", TEST_CASES)
+def test_process_file_streaming_crlf(tmp_path, test_case):
+    """Test that CRLF line endings and surrounding whitespace are not read as digits."""
+    with open(test_case["input_file"], "r") as f:
+        banks = [line.strip() for line in f if line.strip()]
+    input_file = tmp_path / "crlf.txt"
+    input_file.write_bytes("".join(f" {bank} \r\n" for bank in banks).encode())
+    total_joltage = process_file_streaming(str(input_file), test_case["num_batteries"], chunk_size=5)
+    assert total_joltage == test_case["expected_joltage"]
+
+
+def test_select_batteries_streaming_rejects_non_digits():
+    """Test that bytes other than digits in a bank raise a ValueError."""
+    with pytest.raises(ValueError):
+        select_batteries_streaming(io.BytesIO(b"12x4"), 4, 2)
+
+
+@pytest.mark.parametrize("content", ["19\n3a\n", "19\n3/\n", "1\xe9\n"])
+def test_non_digits_rejected_in_every_mode(tmp_path, content):
+    """Test that every mode raises a ValueError for a bank with a non-digit."""
+    input_file = tmp_path / "invalid.txt"
+    input_file.write_text(content)
+    for process in (process_file, process_file_batch, process_file_streaming):
+        with pytest.raises(ValueError):
+            process(str(input_file))
@@ -1,5 +1,50 @@
 import argparse
+import json
 import logging
+import mmap
+import sys
+import time
+
+import numpy as np
+
+
+# Offsets of the 8 neighbors of a cell (Moore neighborhood), as (row, column) deltas
+MOORE_OFFSETS = ((-1, -1), (-1, 0), (-1, 1), (0, -1), (0, 1), (1, -1), (1, 0), (1, 1))
+
+# Offsets of the 4 orthogonal neighbors of a cell (von Neumann neighborhood)
+VON_NEUMANN_OFFSETS = ((-1, 0), (0, -1), (0, 1), (1, 0))
+
+# Grids with a smaller fraction of "@" cells are solved with the sparse engine
+SPARSE_DENSITY_THRESHOLD = 0.1
+
+# Number of bytes at the start of the file sampled to measure the density
+DENSITY_SAMPLE_BYTES = 1 << 16
+
+
+def timed(iterable, stats: dict, phase: str, counter: str | None = None):
+    """
+    Yield the items of iterable while profiling it.
+    
+    The time spent producing the items is added to stats["phases"][phase] and,
+    if counter is given, the number of items to stats["counters"][counter].
+    """
+    phases = stats["phases"]
+    counters = stats["counters"]
+    phases.setdefault(phase, 0.0)
+    if counter is not None:
+        counters.setdefault(counter, 0)
+    iterator = iter(iterable)
+    while True:
+        start = time.perf_counter()
+        try:
+            item = next(iterator)
+        except StopIteration:
+            phases[phase] += time.perf_counter() - start
+            return
+        phases[phase] += time.perf_counter() - start
+        if counter is not None:
+            counters[counter] += 1
+        yield item
 
 
 def count_surrounding_ones_at_index(above_line: list[int], current_line: list[int], below_line: list[int], index: int) -> int:
@@ -77,21 +122,52 @@ def line_to_array(line: str) -> list[int]:
     arr = [1 if char == '@' else 0 for char in line.strip()]
     return [0] + arr + [0]
 
-def count_elements_with_fewer_than_4_surrounding_ones(input_file: str) -> int:
+def count_elements_with_fewer_than_4_surrounding_ones(input_file: str, stats: dict | None = None, engine: str = "auto") -> int:
     """
     Process an input file and return the count of elements with fewer than 4 surrounding 1s.
     
     Args:
         input_file: Path to the input file
+        stats: If given, a {"phases": {}, "counters": {}} dictionary that is filled
+               with the time spent reading the input and computing, and with the
+               number of lines read and cells visited
+        engine: "dense" scans every cell, "sparse" only the "@" cells, "mmap" maps
+                the file and scans it with NumPy (or uses sparse if the lines have
+                different lengths), and "auto" picks dense or sparse from the
+                density measured at the start of the file
     
     Returns:
         Count of elements with fewer than 4 surrounding 1s
     """
+    if engine == "auto":
+        engine = choose_engine(input_file)
+    if engine == "sparse":
+        return count_elements_with_fewer_than_4_surrounding_ones_sparse(input_file, stats)
+    if engine == "mmap":
+        start = time.perf_counter()
+        mask = load_grid_mask(input_file)
+        if mask is not None:
+            if stats is not None:
+                stats["phases"]["parse"] = time.perf_counter() - start
+            return count_elements_with_fewer_than_4_surrounding_ones_mask(mask, stats)
+        # Ragged grids are read as text, by the engine that doesn't assume a fixed width
+        return count_elements_with_fewer_than_4_surrounding_ones_sparse(input_file, stats)
+    
     # Process file line by line, keeping only current, previous, and next in memory
     with open(input_file, 'r') as f:
+        lines = f
+        if stats is not None:
+            start = time.perf_counter()
+            lines = timed(f, stats, "parse", counter="lines")
+        # Skip empty lines, like the other engines
+        lines = (line for line in lines if line.strip())
+        
         # Get first line to determine array length
-        first_line = f.readline().strip()
+        first_line = next(lines, '').strip()
         if not first_line:
+            if stats is not None:
+                stats["phases"]["compute"] = 0.0
+                stats["counters"]["cells_visited"] = 0
             return 0
         
         # Array length after adding padding (original length + 2 for beginning and end)
@@ -113,7 +189,7 @@ def count_elements_with_fewer_than_4_surrounding_ones(input_file: str) -> int:
         logging.debug(f"Current: {current_line}")
         
         # Peek ahead for next line
-        next_line_str = f.readline().strip()
+        next_line_str = next(lines, '').strip()
         if next_line_str:
             next_line = line_to_array(next_line_str)
             logging.debug(f"Below: {next_line}")
@@ -142,7 +218,7 @@ def count_elements_with_fewer_than_4_surrounding_ones(input_file: str) -> int:
             line_number += 1
             
             # Peek ahead for next line
-            next_line_str = f.readline().strip()
+            next_line_str = next(lines, '').strip()
             if next_line_str:
                 next_line = line_to_array(next_line_str)
             else:
@@ -166,9 +242,14 @@ def count_elements_with_fewer_than_4_surrounding_ones(input_file: str) -> int:
                 if count < 4:
                     count_fewer_than_4 += 1
     
+    if stats is not None:
+        stats["phases"]["compute"] = time.perf_counter() - start - stats["phases"]["parse"]
+        # Every cell of every line is visited once
+        stats["counters"]["cells_visited"] = line_number * (array_length - 2)
+    
     return count_fewer_than_4
 
-def count_elements_that_can_be_removed(input_file: str) -> int:
+def count_elements_that_can_be_removed(input_file: str, stats: dict | None = None, engine: str = "auto") -> int:
     """
     Process an input file and return the count of elements that can be removed.
     Elements with fewer than 4 surrounding ones are removed in multiple passes
@@ -176,17 +257,38 @@ def count_elements_that_can_be_removed(input_file: str) -> int:
     
     Args:
         input_file: Path to the input file
+        stats: If given, a {"phases": {}, "counters": {}} dictionary that is filled
+               with the time spent parsing and computing, and with the number of
+               passes and the cells visited and removed in each pass
+        engine: "dense" scans every cell, "sparse" only the "@" cells, "mmap" maps
+                the file and scans it with NumPy (or uses sparse if the lines have
+                different lengths), and "auto" picks dense or sparse from the
+                density measured at the start of the file
     
     Returns:
         Count of elements that can be removed
     """
+    if engine == "auto":
+        engine = choose_engine(input_file)
+    if engine == "sparse":
+        return count_elements_that_can_be_removed_sparse(input_file, stats)
+    if engine == "mmap":
+        start = time.perf_counter()
+        mask = load_grid_mask(input_file)
+        if mask is not None:
+            if stats is not None:
+                stats["phases"]["parse"] = time.perf_counter() - start
+            return count_elements_that_can_be_removed_mask(mask, stats)
+        # Ragged grids are read as text, by the engine that doesn't assume a fixed width
+        return count_elements_that_can_be_removed_sparse(input_file, stats)
+    
+    if stats is not None:
+        start = time.perf_counter()
+    
     # Read entire file into a 2D array
     with open(input_file, 'r') as f:
         lines = f.readlines()
     
-    if not lines:
-        return 0
-    
     # Convert each line to array (adds padding at beginning and end)
     grid = []
     for line in lines:
@@ -194,6 +296,13 @@ def count_elements_that_can_be_removed(input_file: str) -> int:
             grid.append(line_to_array(line))
     
     if not grid:
+        if stats is not None:
+            # Same record as a single pass over an empty grid
+            stats["phases"]["parse"] = time.perf_counter() - start
+            stats["phases"]["compute"] = 0.0
+            stats["counters"]["cells_visited_per_pass"] = [0]
+            stats["counters"]["removed_per_pass"] = [0]
+            stats["counters"]["passes"] = 1
         return 0
     
     # Get array length (all lines should have same length after padding)
@@ -203,6 +312,12 @@ def count_elements_that_can_be_removed(input_file: str) -> int:
     # Add buffer lines above and below
     grid_with_buffers = [empty_array] + grid + [empty_array]
     
+    if stats is not None:
+        parsed = time.perf_counter()
+        stats["phases"]["parse"] = parsed - start
+        stats["counters"]["cells_visited_per_pass"] = []
+        stats["counters"]["removed_per_pass"] = []
+    
     # Now grid_with_buffers is a 2D array with:
     # - Buffer line at the top (index 0)
     # - Original data lines (indices 1 to len(grid))
@@ -238,12 +353,498 @@ def count_elements_that_can_be_removed(input_file: str) -> int:
         
         total_removed += removed_this_pass
         
+        if stats is not None:
+            # Every pass visits every cell of the grid
+            stats["counters"]["cells_visited_per_pass"].append(len(grid) * (array_length - 2))
+            stats["counters"]["removed_per_pass"].append(removed_this_pass)
+        
+        # If no elements were removed this pass, we're done
+        if removed_this_pass == 0:
+            break
+    
+    if stats is not None:
+        stats["phases"]["compute"] = time.perf_counter() - parsed
+        stats["counters"]["passes"] = len(stats["counters"]["removed_per_pass"])
+    
+    return total_removed
+
+
+def measure_density(input_file: str, sample_bytes: int = DENSITY_SAMPLE_BYTES) -> float:
+    """
+    Estimate the fraction of "@" cells from the first bytes of a grid file.
+    
+    Args:
+        input_file: Path to the input file
+        sample_bytes: Number of bytes to sample
+    
+    Returns:
+        Fraction of cells in the sample that are "@" (0.0 for an empty file)
+    """
+    with open(input_file, 'rb') as f:
+        sample = f.read(sample_bytes)
+    occupied = sample.count(b'@')
+    cells = occupied + sample.count(b'.')
+    return occupied / cells if cells else 0.0
+
+
+def choose_engine(input_file: str) -> str:
+    """Return "sparse" for grids whose measured density is low, "dense" otherwise."""
+    return "sparse" if measure_density(input_file) < SPARSE_DENSITY_THRESHOLD else "dense"
+
+
+def load_occupied_cells(input_file: str) -> tuple[set[tuple[int, int]], int, int]:
+    """
+    Read a grid file into the set of (row, column) coordinates of its "@" cells.
+    
+    Only occupied cells are stored, so memory scales with their number rather than
+    with the area of the grid. Empty lines are skipped.
+    
+    Args:
+        input_file: Path to the input file
+    
+    Returns:
+        Tuple of (set of (row, column) coordinates, number of rows, number of columns)
+    """
+    cells = set()
+    row = 0
+    columns = 0
+    with open(input_file, 'r') as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            columns = max(columns, len(line))
+            column = line.find('@')
+            while column != -1:
+                cells.add((row, column))
+                column = line.find('@', column + 1)
+            row += 1
+    return cells, row, columns
+
+
+def count_neighbors(
+    cells: set[tuple[int, int]], offsets: tuple[tuple[int, int], ...] = MOORE_OFFSETS
+) -> dict[tuple[int, int], int]:
+    """Return the number of occupied neighbors of every occupied cell."""
+    return {
+        (row, column): sum((row + dr, column + dc) in cells for dr, dc in offsets)
+        for row, column in cells
+    }
+
+
+def peel(
+    cells: set[tuple[int, int]],
+    threshold: int = 4,
+    offsets: tuple[tuple[int, int], ...] = MOORE_OFFSETS,
+):
+    """
+    Repeatedly remove the cells with fewer than threshold occupied neighbors.
+    
+    All cells of a pass are removed at once, as in count_elements_that_can_be_removed.
+    After the first pass, a pass only checks the neighbors of the cells removed in the
+    previous pass, since no other cell's count has changed.
+    
+    Args:
+        cells: Set of (row, column) coordinates of the occupied cells (not modified)
+        threshold: Cells with fewer occupied neighbors than this are removed
+        offsets: (row, column) deltas of the neighbors of a cell
+    
+    Yields:
+        Tuple of (number of cells checked, list of cells removed) for each pass, the
+        last pass being the first one that removes nothing
+    """
+    neighbor_counts = count_neighbors(cells, offsets)
+    candidates = cells
+    
+    while True:
+        positions_to_remove = [cell for cell in candidates if neighbor_counts[cell] < threshold]
+        yield len(candidates), positions_to_remove
+        
         # If no elements were removed this pass, we're done
+        if not positions_to_remove:
+            return
+        
+        # Remove marked elements and update the counts of their remaining neighbors
+        for cell in positions_to_remove:
+            del neighbor_counts[cell]
+        candidates = set()
+        for row, column in positions_to_remove:
+            for dr, dc in offsets:
+                neighbor = (row + dr, column + dc)
+                if neighbor in neighbor_counts:
+                    neighbor_counts[neighbor] -= 1
+                    candidates.add(neighbor)
+
+
+def count_elements_with_fewer_than_4_surrounding_ones_sparse(input_file: str, stats: dict | None = None) -> int:
+    """
+    Sparse version of count_elements_with_fewer_than_4_surrounding_ones.
+    
+    Args:
+        input_file: Path to the input file
+        stats: If given, a {"phases": {}, "counters": {}} dictionary that is filled
+               with the time spent parsing and computing, and with the number of
+               lines read and cells visited (only the "@" cells are visited)
+    
+    Returns:
+        Count of elements with fewer than 4 surrounding 1s
+    """
+    if stats is not None:
+        start = time.perf_counter()
+    
+    cells, rows, _ = load_occupied_cells(input_file)
+    
+    if stats is not None:
+        parsed = time.perf_counter()
+        stats["phases"]["parse"] = parsed - start
+    
+    count_fewer_than_4 = sum(count < 4 for count in count_neighbors(cells).values())
+    
+    if stats is not None:
+        stats["phases"]["compute"] = time.perf_counter() - parsed
+        stats["counters"]["lines"] = rows
+        stats["counters"]["cells_visited"] = len(cells)
+    
+    return count_fewer_than_4
+
+
+def count_elements_that_can_be_removed_sparse(input_file: str, stats: dict | None = None) -> int:
+    """
+    Sparse version of count_elements_that_can_be_removed.
+    
+    Neighbor counts are kept for the occupied cells only, see peel().
+    
+    Args:
+        input_file: Path to the input file
+        stats: If given, a {"phases": {}, "counters": {}} dictionary that is filled
+               with the time spent parsing and computing, and with the number of
+               passes and the cells visited and removed in each pass
+    
+    Returns:
+        Count of elements that can be removed
+    """
+    if stats is not None:
+        start = time.perf_counter()
+    
+    cells, _, _ = load_occupied_cells(input_file)
+    
+    if stats is not None:
+        parsed = time.perf_counter()
+        stats["phases"]["parse"] = parsed - start
+        stats["counters"]["cells_visited_per_pass"] = []
+        stats["counters"]["removed_per_pass"] = []
+    
+    total_removed = 0
+    for visited, positions_to_remove in peel(cells):
+        total_removed += len(positions_to_remove)
+        if stats is not None:
+            stats["counters"]["cells_visited_per_pass"].append(visited)
+            stats["counters"]["removed_per_pass"].append(len(positions_to_remove))
+    
+    if stats is not None:
+        stats["phases"]["compute"] = time.perf_counter() - parsed
+        stats["counters"]["passes"] = len(stats["counters"]["removed_per_pass"])
+    
+    return total_removed
+
+
+def peel_layers(
+    input_file: str,
+    threshold: int = 4,
+    offsets: tuple[tuple[int, int], ...] = MOORE_OFFSETS,
+) -> tuple[list[list[int]], list[int]]:
+    """
+    Find the pass in which each element is removed.
+    
+    Args:
+        input_file: Path to the input file
+        threshold: Elements with fewer surrounding ones than this are removed
+        offsets: (row, column) deltas of the surrounding elements, e.g. MOORE_OFFSETS
+                 or VON_NEUMANN_OFFSETS
+    
+    Returns:
+        Tuple of (layers, counts): layers[row][column] is the 1-based pass in which the
+        element is removed, or 0 if it is empty or never removed, and counts[i] is the
+        number of elements removed in pass i + 1
+    """
+    cells, rows, columns = load_occupied_cells(input_file)
+    layers = [[0] * columns for _ in range(rows)]
+    counts = []
+    for layer, (_, positions_to_remove) in enumerate(peel(cells, threshold, offsets), start=1):
+        if not positions_to_remove:
+            break
+        for row, column in positions_to_remove:
+            layers[row][column] = layer
+        counts.append(len(positions_to_remove))
+    return layers, counts
+
+
+# load_grid_mask checks the mapped file in blocks of this many bytes
+GRID_SCAN_BYTES = 1 << 24
+
+
+def load_grid_mask(input_file: str) -> np.ndarray | None:
+    """
+    Memory-map a fixed-width grid file and return a boolean mask of its "@" cells.
+    
+    The file is viewed as a (rows x (columns + 1)) byte array without copying it, so
+    the mask is the only copy of the grid held in memory.
+    
+    Args:
+        input_file: Path to the input file
+    
+    Returns:
+        A (rows x columns) boolean array, or None if the file is empty, its lines
+        don't all have the same length or it has carriage returns
+    """
+    with open(input_file, 'rb') as f:
+        try:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # Empty file
+            return None
+    
+    with mapped:
+        columns = mapped.find(b'\n')
+        size = len(mapped)
+        # The last line may lack its newline
+        if columns <= 0 or (size + 1) % (columns + 1) not in (0, 1):
+            return None
+        rows = (size + 1) // (columns + 1)
+        
+        data = np.frombuffer(mapped, dtype=np.uint8)
+        full_lines = data[: (size // (columns + 1)) * (columns + 1)].reshape(-1, columns + 1)
+        ragged = not (full_lines[:, columns] == ord('\n')).all()
+        block = None
+        if not ragged:
+            # A blank or short line shifts the next ones without moving the last
+            # column, so also check that the only newlines are at the ends of lines.
+            # Carriage returns would be read as cells. The file is scanned in blocks
+            # so that the comparisons don't hold a copy of it.
+            newlines = 0
+            for offset in range(0, size, GRID_SCAN_BYTES):
+                block = data[offset : offset + GRID_SCAN_BYTES]
+                newlines += int(np.count_nonzero(block == ord('\n')))
+                if (block == ord('\r')).any():
+                    ragged = True
+                    break
+            ragged = ragged or newlines != len(full_lines)
+        if not ragged:
+            mask = np.empty((rows, columns), dtype=bool)
+            np.equal(full_lines[:, :columns], ord('@'), out=mask[: len(full_lines)])
+            if rows > len(full_lines):
+                np.equal(data[len(full_lines) * (columns + 1) :], ord('@'), out=mask[-1])
+        # Views of the map must be released before it is closed
+        del data, full_lines, block
+    
+    return None if ragged else mask
+
+
+def count_neighbors_mask(mask: np.ndarray) -> np.ndarray:
+    """Return the number of "@" neighbors of every cell of a boolean grid mask."""
+    padded = np.pad(mask, 1).astype(np.uint8)
+    rows, columns = mask.shape
+    counts = np.zeros(mask.shape, dtype=np.uint8)
+    for dr, dc in MOORE_OFFSETS:
+        counts += padded[1 + dr : 1 + dr + rows, 1 + dc : 1 + dc + columns]
+    return counts
+
+
+def count_elements_with_fewer_than_4_surrounding_ones_mask(mask: np.ndarray, stats: dict | None = None) -> int:
+    """
+    Vectorized version of count_elements_with_fewer_than_4_surrounding_ones.
+    
+    Args:
+        mask: Boolean grid mask, as returned by load_grid_mask
+        stats: If given, a {"phases": {}, "counters": {}} dictionary that is filled
+               with the time spent computing and the number of lines and cells
+               visited
+    
+    Returns:
+        Count of elements with fewer than 4 surrounding 1s
+    """
+    if stats is not None:
+        start = time.perf_counter()
+    
+    count_fewer_than_4 = int(np.count_nonzero(mask & (count_neighbors_mask(mask) < 4)))
+    
+    if stats is not None:
+        stats["phases"]["compute"] = time.perf_counter() - start
+        stats["counters"]["lines"] = mask.shape[0]
+        stats["counters"]["cells_visited"] = mask.size
+    
+    return count_fewer_than_4
+
+
+def count_elements_that_can_be_removed_mask(mask: np.ndarray, stats: dict | None = None) -> int:
+    """
+    Vectorized version of count_elements_that_can_be_removed.
+    
+    Args:
+        mask: Boolean grid mask, as returned by load_grid_mask (modified in place)
+        stats: If given, a {"phases": {}, "counters": {}} dictionary that is filled
+               with the time spent computing, and with the number of passes and the
+               cells visited and removed in each pass
+    
+    Returns:
+        Count of elements that can be removed
+    """
+    if stats is not None:
+        start = time.perf_counter()
+        stats["counters"]["cells_visited_per_pass"] = []
+        stats["counters"]["removed_per_pass"] = []
+    
+    total_removed = 0
+    
+    # Run multiple passes until no more elements are removed
+    while True:
+        positions_to_remove = mask & (count_neighbors_mask(mask) < 4)
+        removed_this_pass = int(np.count_nonzero(positions_to_remove))
+        mask &= ~positions_to_remove
+        total_removed += removed_this_pass
+        
+        if stats is not None:
+            stats["counters"]["cells_visited_per_pass"].append(mask.size)
+            stats["counters"]["removed_per_pass"].append(removed_this_pass)
+        
         if removed_this_pass == 0:
             break
     
+    if stats is not None:
+        stats["phases"]["compute"] = time.perf_counter() - start
+        stats["counters"]["passes"] = len(stats["counters"]["removed_per_pass"])
+    
     return total_removed
 
+
+class GridState:
+    """
+    Grid that keeps every cell's neighbor count and the number of "@" cells with
+    fewer than 4 "@" neighbors up to date as cells are set and cleared.
+    
+    Cells are stored in flat bytearrays with a border of empty cells, so that an edit
+    only touches the 3x3 neighborhood of the cell without bounds checks.
+    """
+    
+    def __init__(self, rows: int, columns: int):
+        """
+        Initialize an empty GridState.
+        
+        Args:
+            rows: Number of rows of the grid
+            columns: Number of columns of the grid
+        """
+        self.rows = rows
+        self.columns = columns
+        self._stride = columns + 2
+        self._occupied = bytearray((rows + 2) * self._stride)
+        self._neighbor_counts = bytearray((rows + 2) * self._stride)
+        self._neighbor_deltas = tuple(dr * self._stride + dc for dr, dc in MOORE_OFFSETS)
+        # Number of "@" cells with fewer than 4 "@" neighbors
+        self.fewer_than_4 = 0
+    
+    @classmethod
+    def from_file(cls, input_file: str) -> "GridState":
+        """Build a GridState from a grid file, computing the initial counts with NumPy."""
+        mask = load_grid_mask(input_file)
+        if mask is None:
+            cells, rows, columns = load_occupied_cells(input_file)
+            mask = np.zeros((rows, columns), dtype=bool)
+            if cells:
+                mask[tuple(np.array(list(cells)).T)] = True
+        
+        grid = cls(*mask.shape)
+        padded = np.pad(mask, 1)
+        grid._occupied[:] = padded.astype(np.uint8).tobytes()
+        # The border cells are counted too, since edits at the edges of the grid update them
+        grid._neighbor_counts[:] = count_neighbors_mask(padded).tobytes()
+        grid.fewer_than_4 = count_elements_with_fewer_than_4_surrounding_ones_mask(mask)
+        return grid
+    
+    def _index(self, row: int, column: int) -> int:
+        if not (0 <= row < self.rows and 0 <= column < self.columns):
+            raise IndexError(f"Cell ({row}, {column}) is outside the {self.rows}x{self.columns} grid")
+        return (row + 1) * self._stride + column + 1
+    
+    def is_set(self, row: int, column: int) -> bool:
+        """Return whether a cell is "@"."""
+        return bool(self._occupied[self._index(row, column)])
+    
+    def neighbor_count(self, row: int, column: int) -> int:
+        """Return the number of "@" neighbors of a cell."""
+        return self._neighbor_counts[self._index(row, column)]
+    
+    def set(self, row: int, column: int) -> None:
+        """Make a cell "@", doing nothing if it already is."""
+        index = self._index(row, column)
+        if self._occupied[index]:
+            return
+        occupied = self._occupied
+        neighbor_counts = self._neighbor_counts
+        occupied[index] = 1
+        for delta in self._neighbor_deltas:
+            neighbor = index + delta
+            neighbor_counts[neighbor] += 1
+            # The neighbor now has 4 neighbors
+            if occupied[neighbor] and neighbor_counts[neighbor] == 4:
+                self.fewer_than_4 -= 1
+        if neighbor_counts[index] < 4:
+            self.fewer_than_4 += 1
+    
+    def clear(self, row: int, column: int) -> None:
+        """Make a cell ".", doing nothing if it already is."""
+        index = self._index(row, column)
+        if not self._occupied[index]:
+            return
+        occupied = self._occupied
+        neighbor_counts = self._neighbor_counts
+        occupied[index] = 0
+        if neighbor_counts[index] < 4:
+            self.fewer_than_4 -= 1
+        for delta in self._neighbor_deltas:
+            neighbor = index + delta
+            neighbor_counts[neighbor] -= 1
+            # The neighbor now has 3 neighbors
+            if occupied[neighbor] and neighbor_counts[neighbor] == 3:
+                self.fewer_than_4 += 1
+    
+    def toggle(self, row: int, column: int) -> None:
+        """Flip a cell between "@" and "."."""
+        if self.is_set(row, column):
+            self.clear(row, column)
+        else:
+            self.set(row, column)
+    
+    def __repr__(self) -> str:
+        return f"rows: {self.rows}, columns: {self.columns}, fewer_than_4: {self.fewer_than_4}"
+
+
+def apply_edits(grid: GridState, edits_file: str) -> int:
+    """
+    Apply edits such as "set 3 5", "clear 0 2" or "toggle 7 7" (row then column),
+    one per line, to a grid.
+    
+    Args:
+        grid: The grid to edit
+        edits_file: Path to the file of edits
+    
+    Returns:
+        Count of elements with fewer than 4 surrounding 1s after the edits
+    """
+    operations = {"set": grid.set, "clear": grid.clear, "toggle": grid.toggle}
+    with open(edits_file, 'r') as f:
+        for line_number, line in enumerate(f, start=1):
+            if not line.strip():
+                continue
+            try:
+                operation, row, column = line.split()
+                operations[operation](int(row), int(column))
+            except (KeyError, ValueError, IndexError) as e:
+                raise ValueError(f"Invalid edit on line {line_number}: {line.strip()!r}") from e
+            logging.debug(f"{line.strip()}: {grid.fewer_than_4} elements with fewer than 4 surrounding 1s")
+    return grid.fewer_than_4
+
+
 def main():
     parser = argparse.ArgumentParser(description="Day 4 solution")
     parser.add_argument(
@@ -258,6 +859,29 @@ def main():
         action="store_true",
         help="Enable verbose output (show intermediate messages)",
     )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Print phase timings and operation counts as JSON to stderr",
+    )
+    parser.add_argument(
+        "--engine",
+        choices=["auto", "dense", "sparse", "mmap"],
+        default="auto",
+        help="Scan every cell (dense), only the '@' cells (sparse) or a memory-mapped "
+        "grid with NumPy (mmap) (default: auto, dense or sparse from the grid density)",
+    )
+    parser.add_argument(
+        "--edits",
+        type=str,
+        help="Also apply the edits in this file (e.g. \"set 3 5\", \"clear 0 2\", \"toggle 7 7\") "
+        "and print the count of elements with fewer than 4 surrounding 1s after them",
+    )
+    parser.add_argument(
+        "--layers",
+        action="store_true",
+        help="Also print the number of elements removed in each pass",
+    )
     args = parser.parse_args()
     
     # Configure logging based on verbose flag
@@ -266,12 +890,42 @@ def main():
     else:
         logging.basicConfig(level=logging.WARNING, format="%(message)s")
     
-    count_fewer_than_4 = count_elements_with_fewer_than_4_surrounding_ones(args.input)
+    # Each function is profiled separately
+    fewer_than_4_stats = {"phases": {}, "counters": {}} if args.profile else None
+    can_be_removed_stats = {"phases": {}, "counters": {}} if args.profile else None
+    
+    count_fewer_than_4 = count_elements_with_fewer_than_4_surrounding_ones(args.input, stats=fewer_than_4_stats, engine=args.engine)
     # Print final count (always printed)
+    start = time.perf_counter()
     print(f"\nTotal elements with fewer than 4 surrounding 1s: {count_fewer_than_4}")
+    if fewer_than_4_stats is not None:
+        fewer_than_4_stats["phases"]["output"] = time.perf_counter() - start
 
-    count_numer_of_elements_that_can_be_removed = count_elements_that_can_be_removed(args.input)
+    count_numer_of_elements_that_can_be_removed = count_elements_that_can_be_removed(args.input, stats=can_be_removed_stats, engine=args.engine)
+    start = time.perf_counter()
     print(f"\nTotal elements that can be removed: {count_numer_of_elements_that_can_be_removed}")
+    if can_be_removed_stats is not None:
+        can_be_removed_stats["phases"]["output"] = time.perf_counter() - start
+    
+    if args.layers:
+        _, counts = peel_layers(args.input)
+        print(f"\nElements removed per pass: {', '.join(map(str, counts))}")
+    
+    if args.edits:
+        count_after_edits = apply_edits(GridState.from_file(args.input), args.edits)
+        print(f"\nTotal elements with fewer than 4 surrounding 1s after edits: {count_after_edits}")
+    
+    if args.profile:
+        print(
+            json.dumps(
+                {
+                    "day": "day4",
+                    "count_elements_with_fewer_than_4_surrounding_ones": fewer_than_4_stats,
+                    "count_elements_that_can_be_removed": can_be_removed_stats,
+                }
+            ),
+            file=sys.stderr,
+        )
 
 if __name__ == "__main__":
     main()
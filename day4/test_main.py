@@ -1,5 +1,14 @@
 import pytest
-from main import count_elements_with_fewer_than_4_surrounding_ones, count_elements_that_can_be_removed
+from main import (
+    VON_NEUMANN_OFFSETS,
+    GridState,
+    apply_edits,
+    choose_engine,
+    count_elements_that_can_be_removed,
+    count_elements_with_fewer_than_4_surrounding_ones,
+    load_grid_mask,
+    peel_layers,
+)
 
 
 TEST_CASES_FEWER_THAN_4 = [
@@ -44,3 +53,182 @@ def test_count_elements_that_can_be_removed(test_case):
         f"expected count={test_case['expected_count']}, got {count}"
     )
 
+
+
+@pytest.mark.parametrize("test_case", TEST_CASES_CAN_BE_REMOVED)
+def test_count_elements_that_can_be_removed_stats(test_case):
+    """Test that profiling stats agree with the result."""
+    stats = {"phases": {}, "counters": {}}
+    count = count_elements_that_can_be_removed(test_case["input_file"], stats=stats)
+    assert sum(stats["counters"]["removed_per_pass"]) == count
+    assert stats["counters"]["removed_per_pass"][-1] == 0
+    assert set(stats["phases"]) == {"parse", "compute"}
+
+
+@pytest.mark.parametrize("test_case", TEST_CASES_FEWER_THAN_4)
+def test_sparse_engine_fewer_than_4(test_case):
+    """Test that the sparse engine matches the dense one."""
+    count = count_elements_with_fewer_than_4_surrounding_ones(test_case["input_file"], engine="sparse")
+    assert count == test_case["expected_count"]
+
+
+@pytest.mark.parametrize("test_case", TEST_CASES_CAN_BE_REMOVED)
+def test_sparse_engine_can_be_removed(test_case):
+    """Test that the sparse engine removes the same cells in the same passes as the dense one."""
+    dense_stats = {"phases": {}, "counters": {}}
+    sparse_stats = {"phases": {}, "counters": {}}
+    count_elements_that_can_be_removed(test_case["input_file"], stats=dense_stats, engine="dense")
+    count = count_elements_that_can_be_removed(test_case["input_file"], stats=sparse_stats, engine="sparse")
+    assert count == test_case["expected_count"]
+    assert sparse_stats["counters"]["removed_per_pass"] == dense_stats["counters"]["removed_per_pass"]
+
+
+def test_choose_engine(tmp_path):
+    """Test that mostly empty grids are solved with the sparse engine."""
+    sparse_grid = tmp_path / "sparse.txt"
+    sparse_grid.write_text(("." * 99 + "@\n") * 100)
+    assert choose_engine(str(sparse_grid)) == "sparse"
+    assert count_elements_with_fewer_than_4_surrounding_ones(str(sparse_grid)) == 100
+    assert count_elements_that_can_be_removed(str(sparse_grid)) == 100
+    assert choose_engine("test_input.txt") == "dense"
+
+
+@pytest.mark.parametrize("test_case", TEST_CASES_CAN_BE_REMOVED)
+def test_peel_layers(test_case):
+    """Test that the layers agree with the passes of count_elements_that_can_be_removed."""
+    stats = {"phases": {}, "counters": {}}
+    count = count_elements_that_can_be_removed(test_case["input_file"], stats=stats, engine="dense")
+    layers, counts = peel_layers(test_case["input_file"])
+    assert counts == stats["counters"]["removed_per_pass"][:-1]
+    assert sum(layer > 0 for row in layers for layer in row) == count
+    for layer, layer_count in enumerate(counts, start=1):
+        assert sum(row.count(layer) for row in layers) == layer_count
+
+
+def test_peel_layers_neighborhoods(tmp_path):
+    """Test the layers of a 3x3 block with both neighborhoods and several thresholds."""
+    grid = tmp_path / "block.txt"
+    grid.write_text("@@@\n@@@\n@@@\n")
+    onion = [[1, 2, 1], [2, 3, 2], [1, 2, 1]]
+    assert peel_layers(str(grid)) == (onion, [4, 4, 1])
+    assert peel_layers(str(grid), threshold=3, offsets=VON_NEUMANN_OFFSETS) == (onion, [4, 4, 1])
+    assert peel_layers(str(grid), threshold=2, offsets=VON_NEUMANN_OFFSETS) == ([[0] * 3] * 3, [])
+
+
+@pytest.mark.parametrize("test_case", TEST_CASES_FEWER_THAN_4)
+def test_mmap_engine_fewer_than_4(test_case):
+    """Test that the memory-mapped engine matches the dense one."""
+    count = count_elements_with_fewer_than_4_surrounding_ones(test_case["input_file"], engine="mmap")
+    assert count == test_case["expected_count"]
+
+
+@pytest.mark.parametrize("test_case", TEST_CASES_CAN_BE_REMOVED)
+def test_mmap_engine_can_be_removed(test_case):
+    """Test that the memory-mapped engine removes the same cells in the same passes as the dense one."""
+    dense_stats = {"phases": {}, "counters": {}}
+    mmap_stats = {"phases": {}, "counters": {}}
+    count_elements_that_can_be_removed(test_case["input_file"], stats=dense_stats, engine="dense")
+    count = count_elements_that_can_be_removed(test_case["input_file"], stats=mmap_stats, engine="mmap")
+    assert count == test_case["expected_count"]
+    assert mmap_stats["counters"]["removed_per_pass"] == dense_stats["counters"]["removed_per_pass"]
+    assert set(mmap_stats["phases"]) == {"parse", "compute"}
+
+
+def test_load_grid_mask(tmp_path):
+    """Test the grid mask, with and without a final newline, and the fallback for ragged or CRLF grids."""
+    grid = tmp_path / "grid.txt"
+    grid.write_text("@.@\n.@.")
+    assert load_grid_mask(str(grid)).tolist() == [[True, False, True], [False, True, False]]
+    grid.write_text("@.@\n.@.\n")
+    assert load_grid_mask(str(grid)).tolist() == [[True, False, True], [False, True, False]]
+
+    grid.write_text("@@@@\n@@@@\n@@\n")
+    assert load_grid_mask(str(grid)) is None
+    assert count_elements_with_fewer_than_4_surrounding_ones(str(grid), engine="mmap") == 4
+
+    # Blank and short lines can add up to whole lines and keep every newline in the last column
+    grid.write_text("@...\n\n@@@\n@...\n")
+    assert load_grid_mask(str(grid)) is None
+    assert count_elements_with_fewer_than_4_surrounding_ones(str(grid), engine="mmap") == 4
+    assert GridState.from_file(str(grid)).fewer_than_4 == 4
+
+    grid.write_bytes(b"@.@\r\n.@.\r\n")
+    assert load_grid_mask(str(grid)) is None
+    assert count_elements_with_fewer_than_4_surrounding_ones(str(grid), engine="mmap") == 3
+
+
+@pytest.mark.parametrize("test_case", TEST_CASES_FEWER_THAN_4)
+def test_grid_state(test_case):
+    """Test that the maintained count matches a grid built one edit at a time and survives toggles."""
+    grid = GridState.from_file(test_case["input_file"])
+    assert grid.fewer_than_4 == test_case["expected_count"]
+
+    edited_grid = GridState(grid.rows, grid.columns)
+    with open(test_case["input_file"], "r") as f:
+        for row, line in enumerate(f):
+            for column, char in enumerate(line.strip()):
+                if char == "@":
+                    edited_grid.set(row, column)
+    assert edited_grid.fewer_than_4 == test_case["expected_count"]
+
+    for row, column in [(0, 0), (1, 1), (grid.rows - 1, grid.columns - 1)]:
+        grid.toggle(row, column)
+        grid.toggle(row, column)
+    assert grid.fewer_than_4 == test_case["expected_count"]
+
+
+def test_apply_edits(tmp_path):
+    """Test edits on a 3x3 block, whose 4 corners start with fewer than 4 neighbors."""
+    grid_file = tmp_path / "block.txt"
+    grid_file.write_text("@@@\n@@@\n@@@\n")
+    edits_file = tmp_path / "edits.txt"
+    # Clearing the center and then (0, 1) leaves only (2, 1) with 4 neighbors,
+    # and setting (2, 2) again changes nothing
+    edits_file.write_text("clear 1 1\ntoggle 0 1\n\nset 2 2\n")
+    grid = GridState.from_file(str(grid_file))
+    assert grid.fewer_than_4 == 4
+    assert apply_edits(grid, str(edits_file)) == 6
+    assert grid.neighbor_count(0, 0) == 1
+
+    edits_file.write_text("flip 0 0\n")
+    with pytest.raises(ValueError):
+        apply_edits(grid, str(edits_file))
+    edits_file.write_text("set 3 0\n")
+    with pytest.raises(ValueError):
+        apply_edits(grid, str(edits_file))
+
+
+def test_engines_agree_on_blank_lines(tmp_path):
+    """Test that blank lines are skipped by every engine, so the engine only changes the speed."""
+    grid = tmp_path / "grid.txt"
+    for text in ["@.........\n\n@.........\n", "\n@@@\n\n\n@@@\n@@@\n\n", "@@@@\n@@@@\n \n@@@@\n"]:
+        grid.write_text(text)
+        fewer_than_4 = {
+            engine: count_elements_with_fewer_than_4_surrounding_ones(str(grid), engine=engine)
+            for engine in ["auto", "dense", "sparse", "mmap"]
+        }
+        can_be_removed = {
+            engine: count_elements_that_can_be_removed(str(grid), engine=engine)
+            for engine in ["auto", "dense", "sparse", "mmap"]
+        }
+        assert len(set(fewer_than_4.values())) == 1, (text, fewer_than_4)
+        assert len(set(can_be_removed.values())) == 1, (text, can_be_removed)
+        assert GridState.from_file(str(grid)).fewer_than_4 == fewer_than_4["dense"]
+
+    # The second line used to end the dense scan
+    grid.write_text("@.........\n\n@.........\n")
+    assert count_elements_with_fewer_than_4_surrounding_ones(str(grid), engine="dense") == 2
+
+
+@pytest.mark.parametrize("engine", ["dense", "sparse", "mmap"])
+def test_stats_keys_on_empty_grid(tmp_path, engine):
+    """Test that an empty grid fills in the same profiling keys as any other grid."""
+    empty_grid = tmp_path / "empty.txt"
+    empty_grid.write_text("")
+    for function in [count_elements_with_fewer_than_4_surrounding_ones, count_elements_that_can_be_removed]:
+        stats = {"phases": {}, "counters": {}}
+        empty_stats = {"phases": {}, "counters": {}}
+        function("test_input.txt", stats=stats, engine=engine)
+        assert function(str(empty_grid), stats=empty_stats, engine=engine) == 0
+        assert set(empty_stats["phases"]) == set(stats["phases"])
+        assert set(empty_stats["counters"]) == set(stats["counters"])
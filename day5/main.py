@@ -1,5 +1,17 @@
 import argparse
+import json
 import logging
+import mmap
+import os
+import re
+import sys
+import time
+from array import array
+from bisect import bisect_right
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
 
 
 class FreshRange:
@@ -7,6 +19,8 @@ class FreshRange:
     Represents a range of numbers (inclusive of both first and last).
     """
     
+    __slots__ = ("first", "last")
+    
     def __init__(self, first: int, last: int):
         """
         Initialize a FreshRange.
@@ -63,6 +77,11 @@ class FreshRange:
         """
         return FreshRange(min(self.first, other.first), max(self.last, other.last))
     
+    def __iter__(self):
+        """Allow unpacking a range as (first, last)."""
+        yield self.first
+        yield self.last
+    
     def __repr__(self) -> str:
         return f"FreshRange({self.first}, {self.last})"
 
@@ -82,34 +101,269 @@ def merge_ranges(ranges: list[FreshRange]) -> list[FreshRange]:
     
     # Sort ranges by first number
     sorted_ranges = sorted(ranges, key=lambda r: r.first)
-    merged = [sorted_ranges[0]]
+    merged = []
+    
+    # Track the range being built as plain ints so that overlaps don't allocate;
+    # a FreshRange is only created once the merged range is complete
+    current_first = sorted_ranges[0].first
+    current_last = sorted_ranges[0].last
     
     for current_range in sorted_ranges[1:]:
-        last_merged = merged[-1]
-        
-        # If current range overlaps with the last merged range, merge them
-        if last_merged.overlaps(current_range):
-            merged[-1] = last_merged.merge(current_range)
+        # If current range overlaps with the range being built, extend it
+        if current_range.first <= current_last:
+            if current_range.last > current_last:
+                current_last = current_range.last
         else:
-            # No overlap, add as a new range
-            merged.append(current_range)
+            # No overlap, emit the finished range and start a new one
+            merged.append(FreshRange(current_first, current_last))
+            current_first = current_range.first
+            current_last = current_range.last
+    
+    merged.append(FreshRange(current_first, current_last))
     
     return merged
 
 
-def count_fresh_ingredients(input_file: str) -> tuple[int, int]:
+class FreshRangeArray:
     """
-    Process an input file and return the count of fresh ingredients and total range elements.
+    Compact bulk container of ranges stored as interleaved (first, last) int64 pairs.
+    
+    Holds millions of ranges without a Python object per range. Ranges are
+    materialized as FreshRange objects only when indexed or iterated.
+    """
+    
+    def __init__(self, ranges=()):
+        """
+        Initialize a FreshRangeArray.
+        
+        Args:
+            ranges: Optional iterable of FreshRange objects or (first, last) pairs
+        """
+        self.data = array('q')
+        for first, last in ranges:
+            self.append(first, last)
+    
+    def append(self, first: int, last: int) -> None:
+        """
+        Append a range to the container.
+        
+        Args:
+            first: The first number in the range (inclusive)
+            last: The last number in the range (inclusive)
+        """
+        self.data.append(first)
+        self.data.append(last)
+    
+    def __len__(self) -> int:
+        return len(self.data) // 2
+    
+    def __getitem__(self, index: int) -> FreshRange:
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("FreshRangeArray index out of range")
+        return FreshRange(self.data[2 * index], self.data[2 * index + 1])
+    
+    def __iter__(self):
+        data = self.data
+        for i in range(0, len(data), 2):
+            yield FreshRange(data[i], data[i + 1])
+    
+    def merged(self) -> 'FreshRangeArray':
+        """
+        Merge overlapping ranges.
+        
+        Returns:
+            A new FreshRangeArray sorted by first number with no overlaps
+        """
+        data = self.data
+        result = FreshRangeArray()
+        if not data:
+            return result
+        
+        # Sort and merge the pairs as int64 arrays instead of Python objects
+        pairs = np.frombuffer(data, dtype=np.int64).reshape(-1, 2)
+        merged_firsts, merged_lasts = merge_range_arrays(pairs[:, 0], pairs[:, 1])
+        merged_pairs = np.empty((len(merged_firsts), 2), dtype=np.int64)
+        merged_pairs[:, 0] = merged_firsts
+        merged_pairs[:, 1] = merged_lasts
+        result.data.frombytes(merged_pairs.tobytes())
+        
+        return result
+    
+    def total_count(self) -> int:
+        """
+        Return the number of elements covered by all ranges.
+        
+        Returns:
+            The sum of the counts of each range (inclusive of both first and last)
+        """
+        data = self.data
+        return sum(data[i + 1] - data[i] + 1 for i in range(0, len(data), 2))
+    
+    def __repr__(self) -> str:
+        return f"FreshRangeArray({list(self)})"
+
+
+def count_in_ranges(firsts: np.ndarray, lasts: np.ndarray, numbers: np.ndarray) -> int:
+    """
+    Count how many numbers are part of any of a list of merged ranges.
     
     Args:
-        input_file: Path to the input file
+        firsts: First number of each merged range, in increasing order
+        lasts: Last number of each merged range
+        numbers: The numbers to check
     
     Returns:
-        Tuple of (count of numbers in ranges, total number of elements in all ranges)
+        The count of numbers in the ranges
+    """
+    if not len(firsts):
+        return 0
+    positions = np.searchsorted(firsts, numbers, side='right') - 1
+    in_range = (positions >= 0) & (numbers <= lasts[np.maximum(positions, 0)])
+    return int(np.count_nonzero(in_range))
+
+
+class FreshRangeIndex:
+    """
+    Merged ranges with prefix sums of their counts, for O(log R) membership and
+    interval count queries.
+    """
+    
+    __slots__ = ("firsts", "lasts", "prefix_counts")
+    
+    def __init__(self, firsts: array, lasts: array, prefix_counts: array):
+        """
+        Initialize a FreshRangeIndex.
+        
+        Args:
+            firsts: First number of each merged range, in increasing order
+            lasts: Last number of each merged range
+            prefix_counts: prefix_counts[i] is the number of elements in the first i ranges
+        """
+        self.firsts = firsts
+        self.lasts = lasts
+        self.prefix_counts = prefix_counts
+    
+    @classmethod
+    def from_merged(cls, merged_ranges) -> 'FreshRangeIndex':
+        """
+        Build an index from ranges sorted by first number with no overlaps.
+        
+        Args:
+            merged_ranges: Output of merge_ranges or FreshRangeArray.merged
+        
+        Returns:
+            The index
+        """
+        firsts = array('q')
+        lasts = array('q')
+        prefix_counts = array('q', [0])
+        running_count = 0
+        try:
+            for first, last in merged_ranges:
+                firsts.append(first)
+                lasts.append(last)
+                running_count += last - first + 1
+                prefix_counts.append(running_count)
+        except OverflowError:
+            raise ValueError("The ranges or their total count do not fit in 64 bits") from None
+        return cls(firsts, lasts, prefix_counts)
+    
+    def __len__(self) -> int:
+        return len(self.firsts)
+    
+    def find(self, number: int) -> int:
+        """
+        Find the range containing a number.
+        
+        Args:
+            number: The number to look up
+        
+        Returns:
+            The position of the range containing the number, or -1 if there is none
+        """
+        position = bisect_right(self.firsts, number) - 1
+        if position >= 0 and number <= self.lasts[position]:
+            return position
+        return -1
+    
+    def contains(self, number: int) -> bool:
+        """Check if a number is part of any range."""
+        return self.find(number) >= 0
+    
+    def count_up_to(self, number: int) -> int:
+        """Return the number of elements of all ranges that are at most number."""
+        position = bisect_right(self.firsts, number)
+        if position == 0:
+            return 0
+        last = self.lasts[position - 1]
+        return self.prefix_counts[position - 1] + min(number, last) - self.firsts[position - 1] + 1
+    
+    def count_between(self, first: int, last: int) -> int:
+        """
+        Return the number of elements of all ranges between first and last.
+        
+        Args:
+            first: Start of the query interval (inclusive)
+            last: End of the query interval (inclusive)
+        
+        Returns:
+            The count of elements in the interval, 0 if first > last
+        """
+        if first > last:
+            return 0
+        return self.count_up_to(last) - self.count_up_to(first - 1)
+    
+    def count_between_many(self, intervals) -> list[int]:
+        """
+        Answer a batch of interval count queries.
+        
+        Args:
+            intervals: Iterable of (first, last) pairs or FreshRange objects
+        
+        Returns:
+            The count of elements in each interval, in order
+        """
+        count_up_to = self.count_up_to
+        return [
+            count_up_to(last) - count_up_to(first - 1) if first <= last else 0
+            for first, last in intervals
+        ]
+    
+    def count_members(self, numbers: np.ndarray) -> int:
+        """
+        Count how many numbers of an int64 array are part of any range.
+        
+        Args:
+            numbers: The numbers to check
+        
+        Returns:
+            The count of numbers in the ranges
+        """
+        # Zero-copy views of the range bounds
+        return count_in_ranges(
+            np.frombuffer(self.firsts, dtype=np.int64), np.frombuffer(self.lasts, dtype=np.int64), numbers
+        )
+    
+    def total_count(self) -> int:
+        """Return the number of elements covered by all ranges."""
+        return self.prefix_counts[-1]
+    
+    def __repr__(self) -> str:
+        return f"FreshRangeIndex({len(self)} ranges, {self.total_count()} elements)"
+
+
+def parse_lines(lines: list[str]) -> tuple[list[FreshRange], list[int]]:
     """
-    with open(input_file, 'r') as f:
-        lines = f.readlines()
+    Parse the lines of an input file, warning about malformed lines.
+    
+    Args:
+        lines: Lines of the input file
     
+    Returns:
+        Tuple of (ranges before the blank line, numbers to check after it)
+    """
     # First, read all ranges (before blank line)
     ranges = []
     numbers = []
@@ -144,24 +398,307 @@ def count_fresh_ingredients(input_file: str) -> tuple[int, int]:
             except ValueError:
                 logging.warning(f"Invalid number format: {line}")
     
-    # Sort and merge all ranges at once
-    merged_ranges = merge_ranges(ranges)
-    logging.debug(f"Final merged ranges: {merged_ranges}")
-    
-    # Count how many numbers fall into any of the merged ranges
-    count = 0
-    for number in numbers:
-        for range_obj in merged_ranges:
-            # Since ranges are sorted by first number, if we've passed all possible ranges, stop
-            if range_obj.first > number:
-                break
-            if range_obj.contains(number):
+    return ranges, numbers
+
+
+# Sections the bulk parser accepts; numbers are limited to 18 digits so they fit in int64
+RANGE_SECTION_PATTERN = re.compile(rb"(?:\d{1,18}-\d{1,18}\n)*\d{1,18}-\d{1,18}\n?")
+NUMBER_SECTION_PATTERN = re.compile(rb"(?:\d{1,18}\n)*(?:\d{1,18}\n?)?")
+
+
+def parse_bytes_bulk(data: bytes) -> tuple[np.ndarray, np.ndarray, np.ndarray] | None:
+    """
+    Parse a well-formed input file with a few vectorized passes over its bytes.
+    
+    Unlike parse_lines, no Python object is created per line, but the input must be
+    exactly ranges, one blank line and numbers, each on its own newline-terminated line.
+    
+    Args:
+        data: Content of the input file
+    
+    Returns:
+        Tuple of int64 arrays (first numbers of the ranges, last numbers of the ranges,
+        numbers to check), or None if the input is not well-formed and must be parsed
+        line by line
+    """
+    separator = data.find(b'\n\n')
+    if separator == -1:
+        return None
+    ranges = parse_range_section_bulk(data[: separator + 1])
+    numbers = parse_number_section_bulk(data[separator + 2 :])
+    if ranges is None or numbers is None:
+        return None
+    return *ranges, numbers
+
+
+def parse_range_section_bulk(section: bytes) -> tuple[np.ndarray, np.ndarray] | None:
+    """Parse "first-last" lines into two int64 arrays, or return None if they are not well-formed."""
+    if not RANGE_SECTION_PATTERN.fullmatch(section):
+        return None
+    bounds = np.fromstring(section.replace(b'-', b' '), dtype=np.int64, sep=' ')
+    return bounds[0::2], bounds[1::2]
+
+
+def parse_number_section_bulk(section: bytes) -> np.ndarray | None:
+    """Parse lines of one number each into an int64 array, or return None if they are not well-formed."""
+    if not NUMBER_SECTION_PATTERN.fullmatch(section):
+        return None
+    return np.fromstring(section, dtype=np.int64, sep=' ')
+
+
+def merge_range_arrays(firsts: np.ndarray, lasts: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Vectorized version of merge_ranges for ranges stored as two int64 arrays.
+    
+    Args:
+        firsts: First number of each range
+        lasts: Last number of each range
+    
+    Returns:
+        Tuple of (first numbers, last numbers) of the merged ranges, sorted by first number
+    """
+    if len(firsts) == 0:
+        return firsts, lasts
+    order = np.argsort(firsts, kind='stable')
+    firsts = firsts[order]
+    # Furthest last number of the ranges so far
+    reach = np.maximum.accumulate(lasts[order])
+    # A merged range starts where a range begins after everything before it ended
+    starts = np.flatnonzero(firsts[1:] > reach[:-1]) + 1
+    starts = np.concatenate(([0], starts))
+    ends = np.concatenate((starts[1:] - 1, [len(firsts) - 1]))
+    return firsts[starts], reach[ends]
+
+
+def count_fresh_ingredients(input_file: str, stats: dict | None = None) -> tuple[int, int]:
+    """
+    Process an input file and return the count of fresh ingredients and total range elements.
+    
+    Args:
+        input_file: Path to the input file
+        stats: If given, a {"phases": {}, "counters": {}} dictionary that is filled
+               with the time spent parsing and computing, and with the number of
+               ranges, merged ranges and numbers checked
+    
+    Returns:
+        Tuple of (count of numbers in ranges, total number of elements in all ranges)
+    """
+    if stats is not None:
+        start = time.perf_counter()
+    
+    with open(input_file, 'rb') as f:
+        data = f.read()
+    
+    # Verbose runs log every number, so they keep the line by line path
+    bulk = None
+    if not logging.getLogger().isEnabledFor(logging.DEBUG):
+        bulk = parse_bytes_bulk(data)
+    
+    if bulk is not None:
+        firsts, lasts, numbers = bulk
+        num_ranges = len(firsts)
+        
+        if stats is not None:
+            parsed = time.perf_counter()
+            stats["phases"]["parse"] = parsed - start
+        
+        merged_firsts, merged_lasts = merge_range_arrays(firsts, lasts)
+        index = FreshRangeIndex.from_merged(zip(merged_firsts.tolist(), merged_lasts.tolist()))
+        count = index.count_members(numbers)
+        total_elements = index.total_count()
+        num_merged = len(index)
+    else:
+        ranges, numbers = parse_lines(data.decode().splitlines())
+        num_ranges = len(ranges)
+        
+        if stats is not None:
+            parsed = time.perf_counter()
+            stats["phases"]["parse"] = parsed - start
+        
+        # Sort and merge all ranges at once
+        merged_ranges = merge_ranges(ranges)
+        logging.debug(f"Final merged ranges: {merged_ranges}")
+        
+        # Plain lists keep numbers that don't fit in 64 bits working here
+        merged_firsts = [range_obj.first for range_obj in merged_ranges]
+        
+        # Count how many numbers fall into any of the merged ranges
+        count = 0
+        for number in numbers:
+            position = bisect_right(merged_firsts, number) - 1
+            if position >= 0 and merged_ranges[position].contains(number):
                 count += 1
-                logging.debug(f"Number {number} is in range {range_obj}")
-                break  # Number can only be in one range (since ranges don't overlap)
+                logging.debug(f"Number {number} is in range {merged_ranges[position]}")
+        
+        # Calculate total number of elements in all ranges
+        total_elements = sum(range_obj.count() for range_obj in merged_ranges)
+        num_merged = len(merged_ranges)
     
-    # Calculate total number of elements in all ranges
-    total_elements = sum(range_obj.count() for range_obj in merged_ranges)
+    if stats is not None:
+        stats["phases"]["compute"] = time.perf_counter() - parsed
+        stats["counters"]["ranges"] = num_ranges
+        stats["counters"]["merged_ranges"] = num_merged
+        stats["counters"]["numbers_checked"] = len(numbers)
+    
+    return count, total_elements
+
+
+# Blank line between the ranges and the numbers; like parse_lines, a line of
+# whitespace counts as blank
+SEPARATOR_PATTERN = re.compile(rb"\n[ \t\r\f\v]*\n")
+
+# Each worker answers this many shards of the numbers on average, to balance the load
+SHARDS_PER_WORKER = 4
+
+
+def count_shard(input_file: str, start: int, stop: int, index_name: str, num_ranges: int) -> tuple[int, int]:
+    """
+    Count the fresh numbers in a shard of the numbers section, in a worker process.
+    
+    Args:
+        input_file: Path to the input file
+        start: Offset of the first byte of the shard, at the start of a line
+        stop: Offset just past the last byte of the shard, at the start of a line
+        index_name: Name of the shared memory block holding the merged ranges, as
+                    num_ranges first numbers followed by num_ranges last numbers
+        num_ranges: Number of merged ranges
+    
+    Returns:
+        Tuple of (count of numbers in ranges, count of numbers checked)
+    """
+    with open(input_file, 'rb') as f:
+        f.seek(start)
+        section = f.read(stop - start)
+    
+    numbers = parse_number_section_bulk(section)
+    if numbers is None:
+        # A leading blank line makes parse_lines read every line as a number
+        _, number_list = parse_lines([''] + section.decode().splitlines())
+        # Numbers that don't fit in int64 can't be in the ranges, which do
+        numbers = np.array([n for n in number_list if -2**63 <= n < 2**63], dtype=np.int64)
+        num_checked = len(number_list)
+    else:
+        num_checked = len(numbers)
+    
+    index_memory = shared_memory.SharedMemory(name=index_name)
+    try:
+        bounds = np.ndarray((2, num_ranges), dtype=np.int64, buffer=index_memory.buf)
+        count = count_in_ranges(bounds[0], bounds[1], numbers)
+        # Views of the block must be released before it is closed
+        del bounds
+    finally:
+        index_memory.close()
+    
+    return count, num_checked
+
+
+def shard_offsets(mapped: mmap.mmap, start: int, stop: int, num_shards: int) -> list[int]:
+    """Split [start, stop) into up to num_shards pieces, each starting at the start of a line."""
+    offsets = [start]
+    for i in range(1, num_shards):
+        offset = start + (stop - start) * i // num_shards
+        newline = mapped.find(b'\n', max(offset - 1, offsets[-1]), stop)
+        if newline == -1 or newline + 1 >= stop:
+            break
+        offsets.append(newline + 1)
+    offsets.append(stop)
+    return offsets
+
+
+def count_fresh_ingredients_parallel(
+    input_file: str, workers: int, stats: dict | None = None
+) -> tuple[int, int]:
+    """
+    Process an input file like count_fresh_ingredients, checking the numbers in
+    worker processes.
+    
+    The merged ranges are built once and shared with the workers through shared
+    memory. Each worker parses and checks newline-aligned byte shards of the numbers
+    section on its own, so the numbers are never held by a single process.
+    
+    Args:
+        input_file: Path to the input file
+        workers: Number of worker processes
+        stats: If given, a {"phases": {}, "counters": {}} dictionary that is filled
+               with the time spent parsing the ranges and checking the numbers, and
+               with the number of ranges, merged ranges, numbers checked and shards
+    
+    Returns:
+        Tuple of (count of numbers in ranges, total number of elements in all ranges)
+    """
+    if stats is not None:
+        start = time.perf_counter()
+    
+    with open(input_file, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            # An empty file can't be mapped
+            return count_fresh_ingredients(input_file, stats=stats)
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            separator = SEPARATOR_PATTERN.search(mapped)
+            ranges_end = separator.start() + 1 if separator else len(mapped)
+            numbers_start = separator.end() if separator else len(mapped)
+            range_section = mapped[:ranges_end]
+            offsets = shard_offsets(mapped, numbers_start, len(mapped), workers * SHARDS_PER_WORKER)
+    
+    ranges = parse_range_section_bulk(range_section)
+    if ranges is None:
+        range_lines = range_section.decode().splitlines()
+        if not all(line.strip() for line in range_lines):
+            # parse_lines splits on more line breaks and strips more whitespace than
+            # the pattern, and it would end the ranges at this earlier blank line
+            return count_fresh_ingredients(input_file, stats=stats)
+        range_list, _ = parse_lines(range_lines)
+        try:
+            ranges = (
+                np.array([r.first for r in range_list], dtype=np.int64),
+                np.array([r.last for r in range_list], dtype=np.int64),
+            )
+        except OverflowError:
+            # The workers share the ranges as int64, so check everything in this process
+            return count_fresh_ingredients(input_file, stats=stats)
+    merged_firsts, merged_lasts = merge_range_arrays(*ranges)
+    # The total can pass 2**63 even when every range fits
+    total_elements = sum(
+        last - first + 1 for first, last in zip(merged_firsts.tolist(), merged_lasts.tolist())
+    )
+    
+    if stats is not None:
+        parsed = time.perf_counter()
+        stats["phases"]["parse"] = parsed - start
+    
+    num_ranges = len(merged_firsts)
+    # A shared memory block can't be empty
+    index_memory = shared_memory.SharedMemory(create=True, size=max(1, 2 * num_ranges * 8))
+    try:
+        bounds = np.ndarray((2, num_ranges), dtype=np.int64, buffer=index_memory.buf)
+        bounds[0] = merged_firsts
+        bounds[1] = merged_lasts
+        del bounds
+        
+        shards = list(zip(offsets[:-1], offsets[1:]))
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(
+                executor.map(
+                    count_shard,
+                    [input_file] * len(shards),
+                    [shard_start for shard_start, _ in shards],
+                    [shard_stop for _, shard_stop in shards],
+                    [index_memory.name] * len(shards),
+                    [num_ranges] * len(shards),
+                )
+            )
+    finally:
+        index_memory.close()
+        index_memory.unlink()
+    
+    count = sum(shard_count for shard_count, _ in results)
+    
+    if stats is not None:
+        stats["phases"]["compute"] = time.perf_counter() - parsed
+        stats["counters"]["ranges"] = len(ranges[0])
+        stats["counters"]["merged_ranges"] = num_ranges
+        stats["counters"]["numbers_checked"] = sum(num_checked for _, num_checked in results)
+        stats["counters"]["shards"] = len(shards)
     
     return count, total_elements
 
@@ -180,6 +717,22 @@ def main():
         action="store_true",
         help="Enable verbose output (show intermediate messages)",
     )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Number of processes checking the numbers (default: 1)",
+    )
+    parser.add_argument(
+        "--queries",
+        type=str,
+        help="File of intervals such as \"10-20\", one per line, for which to print the number of fresh IDs",
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Print phase timings and operation counts as JSON to stderr",
+    )
     args = parser.parse_args()
     
     # Configure logging based on verbose flag
@@ -188,10 +741,34 @@ def main():
     else:
         logging.basicConfig(level=logging.WARNING, format="%(message)s")
     
-    count, total_elements = count_fresh_ingredients(args.input)
+    stats = {"phases": {}, "counters": {}} if args.profile else None
+    
+    if args.workers > 1:
+        count, total_elements = count_fresh_ingredients_parallel(args.input, args.workers, stats=stats)
+    else:
+        count, total_elements = count_fresh_ingredients(args.input, stats=stats)
     # Print final count (always printed)
+    start = time.perf_counter()
     print(f"\nTotal fresh ingredients: {count}")
     print(f"Total elements in ranges: {total_elements}")
+    
+    if stats is not None:
+        stats["phases"]["output"] = time.perf_counter() - start
+    
+    if args.queries:
+        with open(args.input, 'r') as f:
+            ranges, _ = parse_lines(f.readlines())
+        try:
+            index = FreshRangeIndex.from_merged(merge_ranges(ranges))
+        except ValueError as e:
+            parser.error(f"--queries: {e}")
+        with open(args.queries, 'r') as f:
+            intervals, _ = parse_lines(f.readlines())
+        for interval, interval_count in zip(intervals, index.count_between_many(intervals)):
+            print(f"Fresh IDs in {interval.first}-{interval.last}: {interval_count}")
+    
+    if stats is not None:
+        print(json.dumps({"day": "day5", **stats}), file=sys.stderr)
 
 
 if __name__ == "__main__":
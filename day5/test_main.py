@@ -1,5 +1,15 @@
 import pytest
-from main import count_fresh_ingredients
+from main import (
+    FreshRange,
+    FreshRangeArray,
+    FreshRangeIndex,
+    count_fresh_ingredients,
+    count_fresh_ingredients_parallel,
+    merge_range_arrays,
+    merge_ranges,
+    parse_bytes_bulk,
+    parse_lines,
+)
 
 
 TEST_CASES = [
@@ -29,3 +39,118 @@ def test_count_fresh_ingredients(test_case):
         f"expected total_elements={test_case['expected_total_elements']}, got {total_elements}"
     )
 
+
+
+@pytest.mark.parametrize("test_case", TEST_CASES)
+def test_fresh_range_array_merged(test_case):
+    """Test that FreshRangeArray.merged matches merge_ranges."""
+    ranges = []
+    with open(test_case["input_file"], 'r') as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                break
+            first, last = map(int, line.split('-'))
+            ranges.append(FreshRange(first, last))
+
+    merged = FreshRangeArray(ranges).merged()
+    expected = merge_ranges(ranges)
+    assert [(r.first, r.last) for r in merged] == [(r.first, r.last) for r in expected]
+    assert merged.total_count() == test_case["expected_total_elements"]
+
+
+def test_fresh_range_index():
+    """Test membership and interval counts on the merged ranges 3-5 and 10-20."""
+    with open("test_input.txt", 'r') as f:
+        ranges, numbers = parse_lines(f.readlines())
+    index = FreshRangeIndex.from_merged(merge_ranges(ranges))
+    assert len(index) == 2
+    assert sum(index.contains(number) for number in numbers) == 3
+    assert index.total_count() == 14
+    assert index.count_between(4, 11) == 4
+    assert index.count_between(6, 9) == 0
+    assert index.count_between(20, 20) == 1
+    assert index.count_between(11, 4) == 0
+    assert index.count_between_many([(0, 100), (21, 30), FreshRange(5, 10)]) == [14, 0, 2]
+
+
+@pytest.mark.parametrize("test_case", TEST_CASES)
+def test_fresh_range_index_total(test_case):
+    """Test that an interval spanning every range counts all of their elements."""
+    with open(test_case["input_file"], 'r') as f:
+        ranges, _ = parse_lines(f.readlines())
+    index = FreshRangeIndex.from_merged(merge_ranges(ranges))
+    assert index.count_between(0, 2**62) == test_case["expected_total_elements"]
+
+
+@pytest.mark.parametrize("test_case", TEST_CASES)
+def test_parse_bytes_bulk(test_case):
+    """Test that the bulk parser and merge agree with parsing line by line."""
+    with open(test_case["input_file"], 'rb') as f:
+        data = f.read()
+    firsts, lasts, numbers = parse_bytes_bulk(data)
+    ranges, expected_numbers = parse_lines(data.decode().splitlines())
+    assert list(zip(firsts.tolist(), lasts.tolist())) == [(r.first, r.last) for r in ranges]
+    assert numbers.tolist() == expected_numbers
+
+    merged_firsts, merged_lasts = merge_range_arrays(firsts, lasts)
+    expected = merge_ranges(ranges)
+    assert list(zip(merged_firsts.tolist(), merged_lasts.tolist())) == [(r.first, r.last) for r in expected]
+
+
+def test_malformed_lines_fall_back(tmp_path, caplog):
+    """Test that malformed lines are skipped with a warning, as before the bulk parser."""
+    input_file = tmp_path / "input.txt"
+    input_file.write_text("3-5\n10-x\n10-14\n\n4\nfoo\n12\n")
+    assert parse_bytes_bulk(input_file.read_bytes()) is None
+    assert count_fresh_ingredients(str(input_file)) == (2, 8)
+    assert "Invalid range format: 10-x" in caplog.text
+    assert "Invalid number format: foo" in caplog.text
+
+
+@pytest.mark.parametrize("test_case", TEST_CASES)
+def test_count_fresh_ingredients_parallel(test_case):
+    """Test that checking the numbers in worker processes gives the same results."""
+    stats = {"phases": {}, "counters": {}}
+    count, total_elements = count_fresh_ingredients_parallel(test_case["input_file"], 2, stats=stats)
+    assert count == test_case["expected_count"]
+    assert total_elements == test_case["expected_total_elements"]
+    assert stats["counters"]["shards"] > 1
+
+
+def test_count_fresh_ingredients_parallel_malformed(tmp_path):
+    """Test that shards with malformed lines fall back to parsing line by line."""
+    input_file = tmp_path / "input.txt"
+    input_file.write_text("3-5\n10-x\n10-14\n\n4\nfoo\n12\n99999999999999999999\n")
+    assert count_fresh_ingredients_parallel(str(input_file), 2) == (2, 8)
+
+
+def test_ranges_beyond_64_bits(tmp_path):
+    """Test that ranges that don't fit in 64 bits are counted with Python ints in both paths."""
+    input_file = tmp_path / "input.txt"
+    input_file.write_text("1-99999999999999999999\n\n5\n100000000000000000000\n")
+    expected = (1, 99999999999999999999)
+    assert count_fresh_ingredients(str(input_file)) == expected
+    assert count_fresh_ingredients_parallel(str(input_file), 2) == expected
+
+    # Ranges that fit but add up to more than 2**63 elements
+    input_file.write_text(f"0-{2**62}\n{2**62 + 1}-{2**63 - 1}\n\n7\n")
+    assert count_fresh_ingredients_parallel(str(input_file), 2) == (1, 2**63)
+
+
+def test_parallel_separator_matches_parse_lines(tmp_path):
+    """Test that the parallel path ends the ranges at the same blank line as parse_lines."""
+    input_file = tmp_path / "input.txt"
+    for text in [
+        "3-5\n10-14\n \n4\n12\n",
+        "3-5\r\n10-14\r\n\r\n4\r\n12\r\n",
+        "3-5\n\u00a0\n10-14\n\n4\n12\n",
+        "\n3-5\n\n4\n",
+        "",
+    ]:
+        input_file.write_text(text, newline="")
+        serial_stats = {"phases": {}, "counters": {}}
+        parallel_stats = {"phases": {}, "counters": {}}
+        expected = count_fresh_ingredients(str(input_file), stats=serial_stats)
+        assert count_fresh_ingredients_parallel(str(input_file), 2, stats=parallel_stats) == expected
+        assert parallel_stats["counters"]["numbers_checked"] == serial_stats["counters"]["numbers_checked"]
@@ -0,0 +1,173 @@
+import argparse
+import json
+import multiprocessing
+import os
+import resource
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from generators import GENERATORS, parse_size
+from main import SOLVERS, load_day
+
+
+def peak_rss_bytes() -> int:
+    """Return the peak resident set size of the current process in bytes."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is reported in bytes on macOS and in kilobytes elsewhere
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def measure_solver(day: str, name: str, input_file: str, options: dict) -> dict:
+    """
+    Run one solver on one input and measure it.
+
+    Meant to run in a fresh process, so that the peak RSS belongs to this solver alone.
+
+    Args:
+        day: Name of the day directory
+        name: Name of the solver function
+        input_file: Path to the input file
+        options: Solver options (e.g. {"batteries": 2})
+
+    Returns:
+        Dictionary with the result, wall time in seconds and peak RSS in bytes
+    """
+    module = load_day(day)
+    solver = SOLVERS[day][name]
+    start = time.perf_counter()
+    result = solver(module, input_file, options)
+    seconds = time.perf_counter() - start
+    return {"result": result, "seconds": seconds, "peak_rss_bytes": peak_rss_bytes()}
+
+
+def generate_input(day: str, size: int, seed: int, directory: str) -> str:
+    """
+    Generate a synthetic input for a day, reusing it if it was already generated.
+
+    Args:
+        day: Name of the day directory
+        size: Target size of the input in bytes
+        seed: Seed for the random generator
+        directory: Directory where inputs are kept
+
+    Returns:
+        Path to the generated input
+    """
+    path = os.path.join(directory, f"{day}_{size}_{seed}.txt")
+    if not os.path.exists(path):
+        GENERATORS[day](path + ".tmp", size, seed)
+        os.replace(path + ".tmp", path)
+    return path
+
+
+def run_benchmarks(
+    days: list[str], sizes: list[int], seed: int, directory: str, options: dict
+) -> list[dict]:
+    """
+    Benchmark every solver of every day at every size.
+
+    Args:
+        days: Names of the day directories to benchmark
+        sizes: Input sizes in bytes
+        seed: Seed for the input generators
+        directory: Directory where generated inputs are kept
+        options: Solver options shared by all runs
+
+    Returns:
+        One record per (day, size, solver) run
+    """
+    records = []
+    context = multiprocessing.get_context("spawn")
+    for day in days:
+        for size in sizes:
+            input_file = generate_input(day, size, seed, directory)
+            input_bytes = os.path.getsize(input_file)
+            for name in SOLVERS[day]:
+                with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+                    measurement = executor.submit(
+                        measure_solver, day, name, input_file, options
+                    ).result()
+                records.append(
+                    {
+                        "day": day,
+                        "solver": name,
+                        "input_bytes": input_bytes,
+                        "seed": seed,
+                        "seconds": measurement["seconds"],
+                        "bytes_per_second": input_bytes / measurement["seconds"]
+                        if measurement["seconds"]
+                        else None,
+                        "peak_rss_bytes": measurement["peak_rss_bytes"],
+                        "result": measurement["result"],
+                    }
+                )
+    return records
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the solvers on synthetic inputs")
+    parser.add_argument(
+        "--days",
+        nargs="+",
+        default=list(SOLVERS),
+        choices=list(SOLVERS),
+        help="Days to benchmark (default: all)",
+    )
+    parser.add_argument(
+        "--sizes",
+        nargs="+",
+        default=["64KB", "1MB"],
+        help="Input sizes, e.g. 64KB 10MB 1GB (default: 64KB 1MB)",
+    )
+    parser.add_argument(
+        "--seed",
+        type=int,
+        default=0,
+        help="Seed for the input generators (default: 0)",
+    )
+    parser.add_argument(
+        "--inputs-dir",
+        type=str,
+        help="Directory where generated inputs are kept (default: a temporary directory)",
+    )
+    parser.add_argument(
+        "--batteries",
+        type=int,
+        default=2,
+        help="Number of batteries to enable for day3 (default: 2)",
+    )
+    parser.add_argument(
+        "--output",
+        type=str,
+        help="Write the records to this file as JSON",
+    )
+    args = parser.parse_args()
+
+    sizes = [parse_size(size) for size in args.sizes]
+    options = {"batteries": args.batteries}
+
+    if args.inputs_dir:
+        os.makedirs(args.inputs_dir, exist_ok=True)
+        records = run_benchmarks(args.days, sizes, args.seed, args.inputs_dir, options)
+    else:
+        with tempfile.TemporaryDirectory() as directory:
+            records = run_benchmarks(args.days, sizes, args.seed, directory, options)
+
+    print(f"{'day':<12} {'solver':<52} {'bytes':>12} {'seconds':>10} {'MB/s':>10} {'peak RSS MB':>12}")
+    for record in records:
+        throughput = record["bytes_per_second"] or 0
+        print(
+            f"{record['day']:<12} {record['solver']:<52} {record['input_bytes']:>12} "
+            f"{record['seconds']:>10.4f} {throughput / 2**20:>10.2f} "
+            f"{record['peak_rss_bytes'] / 2**20:>12.1f}"
+        )
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(records, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,168 @@
+"""On-disk cache of solver results keyed by the content of their inputs."""
+
+import hashlib
+import json
+import os
+import pickle
+import tempfile
+
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "adventofcode2025")
+
+# Files are hashed in chunks of this many bytes
+HASH_CHUNK_SIZE = 1 << 20
+
+
+def file_digest(path: str) -> str:
+    """Return the SHA-256 hex digest of a file's content."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        while chunk := f.read(HASH_CHUNK_SIZE):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class ResultCache:
+    """
+    Content-addressed cache of solver results stored as one file per result.
+
+    Entries are keyed by the hash of the input file, the hash of the solver's source,
+    the solver name and its parameters, so renaming or moving an input still hits the
+    cache while editing the input or the solver misses it. When the cache grows past
+    max_bytes, the least recently used entries are evicted.
+    """
+
+    def __init__(self, directory: str = DEFAULT_CACHE_DIR, max_bytes: int = 64 << 20):
+        """
+        Initialize a ResultCache.
+
+        Args:
+            directory: Directory holding the cache entries (created if missing)
+            max_bytes: Maximum total size of the entries
+        """
+        self.directory = directory
+        self.max_bytes = max_bytes
+        os.makedirs(directory, exist_ok=True)
+        # Hashes of files already read by this process, keyed by (path, mtime, size)
+        self._digests = {}
+        self._total_bytes = sum(size for _, size, _ in self._entries())
+
+    def _entries(self) -> list[tuple[str, int, float]]:
+        """Return (path, size, last use time) for every entry."""
+        entries = []
+        with os.scandir(self.directory) as it:
+            for entry in it:
+                if not entry.name.endswith(".pickle"):
+                    continue
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    # Evicted by another process
+                    continue
+                entries.append((entry.path, stat.st_size, stat.st_mtime))
+        return entries
+
+    def digest(self, path: str) -> str:
+        """Return the SHA-256 hex digest of a file, hashing it once per process."""
+        stat = os.stat(path)
+        file_id = (os.path.abspath(path), stat.st_mtime_ns, stat.st_size)
+        if file_id not in self._digests:
+            self._digests[file_id] = file_digest(path)
+        return self._digests[file_id]
+
+    def key(self, solver_file: str, name: str, input_file: str, parameters: dict) -> str:
+        """
+        Build the cache key of a solver run.
+
+        Args:
+            solver_file: Path to the source file of the solver
+            name: Name of the solver function
+            input_file: Path to the input file
+            parameters: Parameters that affect the result (e.g. {"batteries": 2})
+
+        Returns:
+            The key, as a hex string
+        """
+        key = json.dumps(
+            [self.digest(solver_file), name, self.digest(input_file), parameters],
+            sort_keys=True,
+        )
+        return hashlib.sha256(key.encode()).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.pickle")
+
+    def get(self, key: str) -> tuple[bool, object]:
+        """
+        Look up a result.
+
+        Args:
+            key: The cache key
+
+        Returns:
+            Tuple of (whether the key was found, the cached result or None)
+        """
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                result = pickle.load(f)
+        except FileNotFoundError:
+            return False, None
+        except Exception:
+            # Unpickling a corrupt or stale entry can raise almost anything; drop it
+            self._remove(path)
+            return False, None
+        try:
+            # Mark the entry as recently used
+            os.utime(path)
+        except FileNotFoundError:
+            # Evicted by another process since it was read
+            pass
+        return True, result
+
+    def _remove(self, path: str) -> None:
+        """Delete an entry, if it is still there, and stop counting its size."""
+        try:
+            size = os.path.getsize(path)
+            os.remove(path)
+        except FileNotFoundError:
+            return
+        self._total_bytes -= size
+
+    def put(self, key: str, result: object) -> None:
+        """
+        Store a result, evicting least recently used entries if the cache is too large.
+
+        Args:
+            key: The cache key
+            result: The result to store
+        """
+        data = pickle.dumps(result)
+        # Write to a temporary file first so readers never see a partial entry
+        fd, temporary_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        path = self._path(key)
+        try:
+            replaced_bytes = os.path.getsize(path)
+        except FileNotFoundError:
+            replaced_bytes = 0
+        os.replace(temporary_path, path)
+        self._total_bytes += len(data) - replaced_bytes
+
+        if self._total_bytes > self.max_bytes:
+            self.evict()
+
+    def evict(self) -> None:
+        """Remove least recently used entries until the cache fits in max_bytes."""
+        entries = sorted(self._entries(), key=lambda entry: entry[2])
+        total_bytes = sum(size for _, size, _ in entries)
+        for path, size, _ in entries:
+            if total_bytes <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total_bytes -= size
+        self._total_bytes = total_bytes
@@ -0,0 +1,142 @@
+"""Seeded generators of synthetic inputs for each day, scaled to a target size."""
+
+import random
+
+
+# Lines are buffered and written in batches of this many bytes
+WRITE_BUFFER_SIZE = 1 << 20
+
+UNITS = {"B": 1, "KB": 1 << 10, "MB": 1 << 20, "GB": 1 << 30}
+
+
+def parse_size(size: str) -> int:
+    """
+    Parse a human readable size such as "64KB", "10MB" or "1GB" into bytes.
+
+    Args:
+        size: The size, as a number optionally followed by B, KB, MB or GB
+
+    Returns:
+        The size in bytes
+    """
+    size = size.strip().upper()
+    for unit in sorted(UNITS, key=len, reverse=True):
+        if size.endswith(unit):
+            return int(float(size[: -len(unit)]) * UNITS[unit])
+    return int(size)
+
+
+def _write_lines(f, target_bytes: int, make_line) -> int:
+    """Write lines produced by make_line() to f until target_bytes is reached."""
+    written = 0
+    buffer = []
+    buffered = 0
+    while written + buffered < target_bytes:
+        line = make_line()
+        buffer.append(line)
+        buffered += len(line)
+        if buffered >= WRITE_BUFFER_SIZE:
+            f.write("".join(buffer))
+            written += buffered
+            buffer = []
+            buffered = 0
+    f.write("".join(buffer))
+    return written + buffered
+
+
+def _generate_lines(path: str, target_bytes: int, make_line) -> int:
+    with open(path, "w") as f:
+        return _write_lines(f, target_bytes, make_line)
+
+
+def generate_day1(path: str, target_bytes: int, seed: int = 0, max_steps: int = 999) -> int:
+    """Write rotations such as "L68" and "R148", one per line."""
+    rng = random.Random(seed)
+    return _generate_lines(
+        path,
+        target_bytes,
+        lambda: f"{rng.choice('LR')}{rng.randint(1, max_steps)}\n",
+    )
+
+
+def generate_day2(path: str, target_bytes: int, seed: int = 0, max_width: int = 100) -> int:
+    """Write a single line of comma-separated ID ranges such as "11-22,95-115"."""
+    rng = random.Random(seed)
+    written = 0
+    parts = []
+    with open(path, "w") as f:
+        while written < target_bytes:
+            start = rng.randint(1, 10 ** rng.randint(2, 10))
+            part = f"{start}-{start + rng.randint(0, max_width)}"
+            if written:
+                part = "," + part
+            parts.append(part)
+            written += len(part)
+            if len(parts) >= 4096:
+                f.write("".join(parts))
+                parts = []
+        parts.append("\n")
+        f.write("".join(parts))
+    return written + 1
+
+
+def generate_day3(path: str, target_bytes: int, seed: int = 0, bank_length: int = 100) -> int:
+    """Write banks of digits 1-9, one bank per line."""
+    rng = random.Random(seed)
+    digits = "123456789"
+    return _generate_lines(
+        path,
+        target_bytes,
+        lambda: "".join(rng.choices(digits, k=bank_length)) + "\n",
+    )
+
+
+def generate_day4(
+    path: str, target_bytes: int, seed: int = 0, width: int = 140, density: float = 0.6
+) -> int:
+    """Write a grid of "@" and "." cells, where density is the fraction of "@" cells."""
+    rng = random.Random(seed)
+    return _generate_lines(
+        path,
+        target_bytes,
+        lambda: "".join("@" if rng.random() < density else "." for _ in range(width)) + "\n",
+    )
+
+
+def generate_day5(
+    path: str,
+    target_bytes: int,
+    seed: int = 0,
+    range_fraction: float = 0.2,
+    max_id: int = 10**15,
+    max_width: int = 10**12,
+) -> int:
+    """
+    Write fresh ID ranges, a blank line and the IDs to check.
+
+    range_fraction is the share of the target size spent on the ranges section.
+    """
+    rng = random.Random(seed)
+
+    def make_range():
+        first = rng.randint(1, max_id)
+        return f"{first}-{first + rng.randint(0, max_width)}\n"
+
+    with open(path, "w") as f:
+        written = _write_lines(f, max(1, int(target_bytes * range_fraction)), make_range)
+        f.write("\n")
+        written += 1
+        written += _write_lines(
+            f, target_bytes - written, lambda: f"{rng.randint(1, max_id)}\n"
+        )
+    return written
+
+
+GENERATORS = {
+    "day1": generate_day1,
+    "day2": generate_day2,
+    "day2_part2": generate_day2,
+    "day3": generate_day3,
+    "day4": generate_day4,
+    "day5": generate_day5,
+}
@@ -0,0 +1,241 @@
+import argparse
+import importlib.util
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from cache import DEFAULT_CACHE_DIR, ResultCache
+from generators import parse_size
+
+
+# Root of the repository, containing one directory per day
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+# Maps each day to its solver functions. Each solver is called as
+# solver(module, input_file, options) and returns the answer for that input.
+SOLVERS = {
+    "day1": {
+        "count_zeros_seen": lambda module, input_file, options: module.count_zeros_seen(
+            input_file
+        ),
+    },
+    "day2": {
+        "calculate_sum_of_invalid_ids_from_file": lambda module, input_file, options: module.calculate_sum_of_invalid_ids_from_file(
+            input_file
+        ),
+    },
+    "day2_part2": {
+        "calculate_sum_of_invalid_ids_from_file": lambda module, input_file, options: module.calculate_sum_of_invalid_ids_from_file(
+            input_file
+        ),
+    },
+    "day3": {
+        "process_file": lambda module, input_file, options: module.process_file(
+            input_file, options["batteries"]
+        ),
+    },
+    "day4": {
+        "count_elements_with_fewer_than_4_surrounding_ones": lambda module, input_file, options: module.count_elements_with_fewer_than_4_surrounding_ones(
+            input_file
+        ),
+        "count_elements_that_can_be_removed": lambda module, input_file, options: module.count_elements_that_can_be_removed(
+            input_file
+        ),
+    },
+    "day5": {
+        "count_fresh_ingredients": lambda module, input_file, options: module.count_fresh_ingredients(
+            input_file
+        ),
+    },
+}
+
+# Options that affect each day's results, used to build cache keys
+SOLVER_OPTIONS = {
+    "day3": ["batteries"],
+}
+
+# Day modules loaded so far in this process
+_loaded_modules = {}
+
+# Result caches opened so far in this process, keyed by directory
+_caches = {}
+
+
+def load_day(day: str):
+    """
+    Import a day's main.py, loading it only the first time it is needed.
+
+    Each day lives in its own directory with a main.py, so the modules are loaded
+    from their file paths under unique names instead of through sys.path.
+
+    Args:
+        day: Name of the day directory (e.g. "day3")
+
+    Returns:
+        The loaded module
+    """
+    if day not in _loaded_modules:
+        path = os.path.join(REPO_ROOT, day, "main.py")
+        spec = importlib.util.spec_from_file_location(f"{day}_main", path)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        _loaded_modules[day] = module
+    return _loaded_modules[day]
+
+
+def parse_task(task: str) -> tuple[str, str]:
+    """
+    Parse a task of the form "DAY" or "DAY:INPUT".
+
+    Args:
+        task: The task string. Without an input, the day's puzzle_input.txt is used.
+
+    Returns:
+        Tuple of (day, input file path)
+    """
+    day, _, input_file = task.partition(":")
+    if day not in SOLVERS:
+        raise ValueError(f"Unknown day '{day}', expected one of {', '.join(SOLVERS)}")
+    if not input_file:
+        input_file = os.path.join(REPO_ROOT, day, "puzzle_input.txt")
+    return day, os.path.abspath(input_file)
+
+
+def open_cache(directory: str, max_bytes: int) -> ResultCache:
+    """Return this process's ResultCache for a directory, opening it on first use."""
+    if directory not in _caches:
+        _caches[directory] = ResultCache(directory, max_bytes)
+    return _caches[directory]
+
+
+def run_task(
+    day: str, input_file: str, options: dict, cache: tuple[str, int] | None = None
+) -> dict:
+    """
+    Run every solver of a day on one input file.
+
+    Args:
+        day: Name of the day directory
+        input_file: Path to the input file
+        options: Solver options (e.g. {"batteries": 2})
+        cache: Optional (directory, max bytes) of a result cache to read and fill
+
+    Returns:
+        Dictionary with the day, the input file and the result of each solver
+    """
+    if cache is None:
+        module = load_day(day)
+        results = {
+            name: solver(module, input_file, options)
+            for name, solver in SOLVERS[day].items()
+        }
+        return {"day": day, "input": input_file, "results": results}
+
+    result_cache = open_cache(*cache)
+    solver_file = os.path.join(REPO_ROOT, day, "main.py")
+    parameters = {option: options[option] for option in SOLVER_OPTIONS.get(day, [])}
+    results = {}
+    for name, solver in SOLVERS[day].items():
+        key = result_cache.key(solver_file, name, input_file, parameters)
+        found, result = result_cache.get(key)
+        if not found:
+            # The day is only imported when a result is missing from the cache
+            result = solver(load_day(day), input_file, options)
+            result_cache.put(key, result)
+        results[name] = result
+    return {"day": day, "input": input_file, "results": results}
+
+
+def run_tasks(
+    tasks: list[tuple[str, str]],
+    options: dict,
+    jobs: int = 1,
+    cache: tuple[str, int] | None = None,
+) -> list[dict]:
+    """
+    Run tasks in this process, or across a pool of worker processes.
+
+    Args:
+        tasks: List of (day, input file) tuples
+        options: Solver options shared by all tasks
+        jobs: Number of worker processes (1 runs everything in this process)
+        cache: Optional (directory, max bytes) of a result cache to read and fill
+
+    Returns:
+        List of task results, in the same order as the tasks
+    """
+    days = [day for day, _ in tasks]
+    input_files = [input_file for _, input_file in tasks]
+    shared = ([options] * len(tasks), [cache] * len(tasks))
+    if jobs <= 1:
+        return list(map(run_task, days, input_files, *shared))
+
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        return list(executor.map(run_task, days, input_files, *shared))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run several days' solutions in one process")
+    parser.add_argument(
+        "tasks",
+        nargs="*",
+        help="Tasks to run, as DAY or DAY:INPUT (default: every day on its puzzle_input.txt)",
+    )
+    parser.add_argument(
+        "--tasks-file",
+        type=str,
+        help="File with additional tasks, one per line",
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=1,
+        help="Number of worker processes (default: 1)",
+    )
+    parser.add_argument(
+        "--batteries",
+        type=int,
+        default=2,
+        help="Number of batteries to enable for day3 (default: 2)",
+    )
+    parser.add_argument(
+        "--cache",
+        action="store_true",
+        help="Reuse results of earlier runs on inputs with the same content",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        type=str,
+        default=DEFAULT_CACHE_DIR,
+        help=f"Directory of the result cache (default: {DEFAULT_CACHE_DIR})",
+    )
+    parser.add_argument(
+        "--cache-max-size",
+        type=str,
+        default="64MB",
+        help="Maximum size of the result cache, e.g. 64MB (default: 64MB)",
+    )
+    args = parser.parse_args()
+
+    task_strings = list(args.tasks)
+    if args.tasks_file:
+        with open(args.tasks_file, "r") as f:
+            task_strings.extend(line.strip() for line in f if line.strip())
+    if not task_strings:
+        task_strings = list(SOLVERS)
+
+    try:
+        tasks = [parse_task(task) for task in task_strings]
+    except ValueError as e:
+        parser.error(str(e))
+
+    options = {"batteries": args.batteries}
+    cache = (args.cache_dir, parse_size(args.cache_max_size)) if args.cache else None
+    for task_result in run_tasks(tasks, options, args.jobs, cache):
+        for name, result in task_result["results"].items():
+            print(f"{task_result['day']} {task_result['input']} {name}: {result}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+import os
+import pickle
+import time
+
+from cache import ResultCache
+from main import parse_task, run_task
+
+
+def test_key_depends_on_content_and_parameters(tmp_path):
+    """Test that keys follow the input's content, not its path."""
+    cache = ResultCache(str(tmp_path / "cache"))
+    first = tmp_path / "first.txt"
+    second = tmp_path / "second.txt"
+    first.write_text("L68\n")
+    second.write_text("L68\n")
+    solver_file = str(first)
+
+    assert cache.key(solver_file, "f", str(first), {}) == cache.key(solver_file, "f", str(second), {})
+    assert cache.key(solver_file, "f", str(first), {"batteries": 2}) != cache.key(
+        solver_file, "f", str(first), {"batteries": 12}
+    )
+
+    second.write_text("R68\n")
+    assert cache.key(solver_file, "f", str(first), {}) != cache.key(solver_file, "f", str(second), {})
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    """Test that the cache stays within its size by evicting the oldest entries."""
+    cache = ResultCache(str(tmp_path), max_bytes=250)
+    cache.put("a", b"x" * 100)
+    time.sleep(0.01)
+    cache.put("b", b"x" * 100)
+    time.sleep(0.01)
+    # Using "a" makes "b" the least recently used entry
+    assert cache.get("a") == (True, b"x" * 100)
+    time.sleep(0.01)
+    cache.put("c", b"x" * 100)
+
+    assert cache.get("b") == (False, None)
+    assert cache.get("a")[0]
+    assert cache.get("c")[0]
+    assert sum(os.path.getsize(tmp_path / name) for name in os.listdir(tmp_path)) <= 250
+
+
+def test_overwriting_an_entry_keeps_its_size_once(tmp_path):
+    """Test that putting the same key again doesn't count the old entry's size."""
+    cache = ResultCache(str(tmp_path), max_bytes=250)
+    cache.put("a", b"x" * 100)
+    for _ in range(5):
+        cache.put("a", b"x" * 100)
+    cache.put("b", b"x" * 100)
+
+    assert cache._total_bytes == sum(os.path.getsize(tmp_path / name) for name in os.listdir(tmp_path))
+    assert cache.get("a")[0]
+    assert cache.get("b")[0]
+
+
+def test_entries_that_fail_to_load_are_misses(tmp_path):
+    """Test that any entry that can't be unpickled is reported missing and deleted."""
+    cache = ResultCache(str(tmp_path))
+    for key, data in [
+        ("truncated", pickle.dumps(list(range(100)))[:-10]),
+        ("garbage", b"not a pickle"),
+        ("missing_class", b"cno_such_module\nNoSuchClass\n."),
+    ]:
+        (tmp_path / f"{key}.pickle").write_bytes(data)
+        assert cache.get(key) == (False, None)
+        assert not (tmp_path / f"{key}.pickle").exists()
+
+
+def test_run_task_with_cache(tmp_path):
+    """Test that cached results match computed results."""
+    day, input_file = parse_task("day5")
+    cache = (str(tmp_path), 1 << 20)
+    computed = run_task(day, input_file, {"batteries": 2}, cache)
+    assert len(os.listdir(tmp_path)) == 1
+    assert run_task(day, input_file, {"batteries": 2}, cache) == computed
+    assert computed["results"]["count_fresh_ingredients"] == (681, 348820208020395)
@@ -0,0 +1,25 @@
+import os
+
+import pytest
+from generators import GENERATORS, parse_size
+from main import run_task
+
+
+@pytest.mark.parametrize("size,expected_bytes", [("512", 512), ("64KB", 65536), ("1.5MB", 1572864), ("1gb", 1 << 30)])
+def test_parse_size(size, expected_bytes):
+    """Test parsing of human readable sizes."""
+    assert parse_size(size) == expected_bytes
+
+
+@pytest.mark.parametrize("day", GENERATORS)
+def test_generated_inputs_are_solvable(day, tmp_path):
+    """Test that generated inputs are deterministic, close to the target size and solvable."""
+    first = tmp_path / "first.txt"
+    second = tmp_path / "second.txt"
+    written = GENERATORS[day](str(first), 4096, seed=1)
+    GENERATORS[day](str(second), 4096, seed=1)
+
+    assert first.read_bytes() == second.read_bytes()
+    assert written == os.path.getsize(first)
+    assert 4096 <= written < 4096 + 512
+    run_task(day, str(first), {"batteries": 2})
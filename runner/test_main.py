@@ -0,0 +1,33 @@
+import os
+
+import pytest
+from main import REPO_ROOT, parse_task, run_tasks
+
+
+EXPECTED_RESULTS = {
+    "day1": {"count_zeros_seen": 6475},
+    "day2": {"calculate_sum_of_invalid_ids_from_file": 23534117921},
+    "day3": {"process_file": 17321},
+    "day4": {
+        "count_elements_with_fewer_than_4_surrounding_ones": 1478,
+        "count_elements_that_can_be_removed": 9120,
+    },
+    "day5": {"count_fresh_ingredients": (681, 348820208020395)},
+}
+
+
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_run_tasks(jobs):
+    """Test that running several days in one call matches each day's answers."""
+    tasks = [parse_task(day) for day in EXPECTED_RESULTS]
+    task_results = run_tasks(tasks, {"batteries": 2}, jobs)
+    for task_result in task_results:
+        assert task_result["results"] == EXPECTED_RESULTS[task_result["day"]]
+
+
+def test_parse_task():
+    """Test parsing of DAY and DAY:INPUT tasks."""
+    assert parse_task("day3") == ("day3", os.path.join(REPO_ROOT, "day3", "puzzle_input.txt"))
+    assert parse_task("day1:/tmp/rotations.txt") == ("day1", "/tmp/rotations.txt")
+    with pytest.raises(ValueError):
+        parse_task("day9")